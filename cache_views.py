@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Display-ready views derived from the dashboard cache.
+
+Both update_cache.py (to precompute them into cache["derived"] at write time)
+and streamlit_app.py (as a fallback for caches written before that) use these,
+so they must stay stdlib-only and free of API keys.
+"""
+
+import heapq
+from operator import itemgetter
+
+# Funding chart / extremes filters
+MIN_FUNDING_OI_USD = 10000
+MAX_FUNDING_RATE = 0.05
+MIN_FUNDING_VOLUME = 10000
+
+# Number of assets shown in the Best Venue table
+VENUE_ASSET_LIMIT = 8
+
+# Alert thresholds
+ALERT_MIN_MARKET_VOLUME = 100000
+ALERT_FUNDING_HIGH = 0.001  # >0.1%
+ALERT_FUNDING_LOW = -0.001  # <-0.1%
+ALERT_VOLUME_SPIKE_PCT = 50
+ALERT_VOLUME_DROP_PCT = -30
+
+# Keys build_derived_views() produces; caches missing any are rebuilt by the app
+DERIVED_VIEW_KEYS = ("funding_markets", "venue_comparison", "market_aggregates", "alerts", "solana_rankings")
+
+
+def is_valid_funding_market(info: dict) -> bool:
+    """Filter for valid funding rate markets: min OI and reasonable funding."""
+    oi_usd = info.get("open_interest", 0) * info.get("last_price", 0)
+    funding = abs(info.get("funding_rate", 0))
+    return oi_usd >= MIN_FUNDING_OI_USD and funding < MAX_FUNDING_RATE  # $10k OI min, <5% funding
+
+
+def build_funding_markets(drift_markets: dict) -> list:
+    """Valid funding markets as [market, funding_rate] pairs, lowest rate first."""
+    valid_markets = [
+        [market, info.get("funding_rate", 0)]
+        for market, info in drift_markets.items()
+        if info.get("volume", 0) > MIN_FUNDING_VOLUME and is_valid_funding_market(info)
+    ]
+    valid_markets.sort(key=lambda x: x[1])
+    return valid_markets
+
+
+def build_venue_comparison(drift_markets: dict, jupiter_markets: dict) -> list:
+    """Per-asset Drift vs Jupiter rows for the Best Venue table."""
+    jupiter_volumes = jupiter_markets.get("volumes", {})
+
+    # Drift markets keyed by asset name, so each asset is looked up once
+    drift_by_asset = {m[:-5]: info for m, info in drift_markets.items() if m.endswith("-PERP")}
+
+    # Dynamically derive common assets from available markets
+    common_assets = sorted(drift_by_asset.keys() & jupiter_volumes.keys())
+
+    # Fallback: if no common assets found, use top assets by combined volume
+    if not common_assets:
+        combined = {
+            asset: drift_by_asset.get(asset, {}).get("volume", 0) + jupiter_volumes.get(asset, 0)
+            for asset in drift_by_asset.keys() | jupiter_volumes.keys()
+        }
+        common_assets = sorted(combined, key=combined.__getitem__, reverse=True)
+
+    rows = []
+    for asset in common_assets[:VENUE_ASSET_LIMIT]:
+        drift_info = drift_by_asset.get(asset, {})
+        rows.append({
+            "asset": asset,
+            "drift_volume": drift_info.get("volume", 0),
+            "jupiter_volume": jupiter_volumes.get(asset, 0),
+            "drift_funding": drift_info.get("funding_rate", 0),
+            "drift_oi_usd": drift_info.get("open_interest", 0) * drift_info.get("last_price", 0),
+        })
+    return rows
+
+
+def build_market_aggregates(drift_markets: dict) -> dict:
+    """Drift volume/OI totals and leaders used by the Quick Insights section."""
+    total_volume = 0
+    active_markets = 0
+    volumes = []
+    open_interest = []
+    for market, info in drift_markets.items():
+        volume = info.get("volume", 0)
+        total_volume += volume
+        if volume > 1000:
+            active_markets += 1
+        volumes.append((market, volume))
+        open_interest.append((market, info.get("open_interest", 0) * info.get("last_price", 0)))
+    return {
+        "drift_total_volume": total_volume,
+        "drift_top_by_volume": [list(x) for x in heapq.nlargest(3, volumes, key=itemgetter(1))],
+        "drift_top_by_oi": [list(x) for x in heapq.nlargest(3, open_interest, key=itemgetter(1))],
+        "drift_active_markets": active_markets,
+    }
+
+
+def build_alerts(drift_markets: dict, protocols: list) -> list:
+    """Unusual market conditions as {"type", "name", "value"} dicts, in display order.
+
+    Types: funding_high / funding_low (value is the funding rate) and
+    volume_spike / volume_drop (value is the 24h change in percent).
+    """
+    alerts = []
+
+    # Extreme funding rates on markets with decent volume
+    for market, info in drift_markets.items():
+        if info.get("volume", 0) <= ALERT_MIN_MARKET_VOLUME:
+            continue
+        funding = info.get("funding_rate", 0)
+        if funding > ALERT_FUNDING_HIGH:
+            alerts.append({"type": "funding_high", "name": market.replace("-PERP", ""), "value": funding})
+        elif funding < ALERT_FUNDING_LOW:
+            alerts.append({"type": "funding_low", "name": market.replace("-PERP", ""), "value": funding})
+
+    # Big volume changes
+    for row in protocols:
+        change = row.get("change_1d", 0) or 0
+        if change > ALERT_VOLUME_SPIKE_PCT:
+            alerts.append({"type": "volume_spike", "name": row["protocol"], "value": change})
+        elif change < ALERT_VOLUME_DROP_PCT:
+            alerts.append({"type": "volume_drop", "name": row["protocol"], "value": change})
+
+    return alerts
+
+
+def build_solana_rankings(global_derivatives: list) -> list:
+    """Solana protocols in the global perps ranking, with 1-based rank and volume share."""
+    global_total = sum(p["volume_24h"] for p in global_derivatives)
+    return [
+        {
+            "name": p["name"],
+            "rank": i + 1,
+            "volume": p["volume_24h"],
+            "share": p["volume_24h"] / global_total * 100 if global_total > 0 else 0,
+        }
+        for i, p in enumerate(global_derivatives)
+        if "Solana" in p.get("chains", [])
+    ]
+
+
+def build_derived_views(cache: dict) -> dict:
+    """All precomputed views stored under cache["derived"]."""
+    drift_markets = cache.get("drift_markets", {})
+    return {
+        "funding_markets": build_funding_markets(drift_markets),
+        "venue_comparison": build_venue_comparison(drift_markets, cache.get("jupiter_markets", {})),
+        "market_aggregates": build_market_aggregates(drift_markets),
+        "alerts": build_alerts(drift_markets, cache.get("protocols", [])),
+        "solana_rankings": build_solana_rankings(cache.get("global_derivatives", [])),
+    }
@@ -18,19 +18,44 @@ Usage:
 """
 
 import argparse
+import functools
+import heapq
 import json
 import logging
+import operator
 import os
+import random
 import sys
 import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 from datetime import datetime, timedelta
-from urllib.request import urlopen, Request
-from urllib.error import HTTPError
 
+import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 load_dotenv()
 
+# orjson is optional: it parses bytes directly and is several times faster
+# on large RPC/Dune/DeFiLlama payloads; stdlib json is the fallback
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+# ijson is optional: streams the DeFiLlama protocols list instead of
+# materializing the whole response
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -57,8 +82,20 @@ else:
 # Fallback RPC for when primary fails
 FALLBACK_RPC_URL = "https://api.mainnet-beta.solana.com"
 
+# Request hedging: when the first RPC endpoint hasn't answered within the hedge
+# delay, the same read-only request is also sent to the other endpoint and the
+# first good response wins. The delay follows the faster endpoint's observed
+# latency so healthy calls are rarely duplicated. Set RPC_HEDGING=0 to disable.
+RPC_HEDGING = os.environ.get("RPC_HEDGING", "1") != "0"
+RPC_HEDGE_MIN_DELAY = 0.2  # seconds
+RPC_HEDGE_LATENCY_FACTOR = 2.0
+RPC_LATENCY_ALPHA = 0.3  # EWMA weight of the newest sample
+RPC_FAILURE_PENALTY = 30.0  # seconds recorded for a failed request (the request timeout)
+
 # DeFiLlama API
 DEFILLAMA_URL = "https://api.llama.fi/overview/derivatives"
+# Skip the multi-year chart arrays; we only read the per-protocol summaries
+DEFILLAMA_PARAMS = {"excludeTotalDataChart": "true", "excludeTotalDataChartBreakdown": "true"}
 
 # Dune API (required)
 DUNE_API_KEY = os.environ.get("DUNE_API_KEY")
@@ -66,6 +103,25 @@ if not DUNE_API_KEY:
     raise ValueError("DUNE_API_KEY environment variable is required")
 DUNE_API_URL = "https://api.dune.com/api/v1"
 
+# Trader counts use Trino's HyperLogLog-based APPROX_DISTINCT (~2.3% standard
+# error), which is much cheaper than an exact COUNT(DISTINCT) over
+# solana.transactions. Set DUNE_EXACT_COUNTS=1 when exact counts are required.
+DUNE_EXACT_COUNTS = os.environ.get("DUNE_EXACT_COUNTS") == "1"
+
+# Shared HTTP session so every fetcher (RPC paging, Dune polling, DeFiLlama,
+# Pacifica, Jupiter, Drift) reuses pooled keep-alive connections instead of a
+# new TCP+TLS handshake per request. Transport-level retries only cover
+# idempotent GETs on 5xx; RPC and Dune POSTs keep their own retry/backoff.
+_HTTP_RETRY = Retry(
+    total=3,
+    backoff_factor=0.3,
+    status_forcelist=(500, 502, 503, 504),
+    allowed_methods=frozenset({"GET"}),
+    raise_on_status=False,
+)
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=_HTTP_RETRY))
+
 
 class DuneCircuitBreaker:
     """Circuit breaker for Dune API to fail fast on repeated failures.
@@ -164,49 +220,180 @@ JUPITER_CUSTODY_ACCOUNTS = {
     "4vkNeXiYEUizLdrpdPS1eC2mccyM4NUPRtERrk6ZETkk": "USDT",
 }
 
+# Dune CASE branches mapping account keys to market names (built once at import)
+DRIFT_CASE_STMT = " ".join(
+    f"WHEN CONTAINS(account_keys, '{acc}') THEN '{mkt}'" for acc, mkt in DRIFT_MARKET_ACCOUNTS.items()
+)
+JUPITER_CASE_STMT = " ".join(
+    f"WHEN CONTAINS(account_keys, '{acc}') THEN '{mkt}'" for acc, mkt in JUPITER_CUSTODY_ACCOUNTS.items()
+)
+
 
-def rpc_call(method: str, params: list, max_retries: int = 3, use_fallback: bool = True) -> dict:
-    """Make an RPC call to the Solana node with retry logic and fallback.
+_rpc_latency = {}  # rpc_url -> EWMA response time in seconds
+_rpc_latency_lock = threading.Lock()
+_HEDGE_EXECUTOR = ThreadPoolExecutor(max_workers=16, thread_name_prefix="rpc-hedge")
 
-    Uses the configured RPC_URL (Helius if available) as primary,
-    falls back to public RPC on repeated failures.
+
+def _record_rpc_latency(rpc_url: str, seconds: float):
+    """Fold one response time (or failure penalty) into the endpoint's EWMA."""
+    with _rpc_latency_lock:
+        previous = _rpc_latency.get(rpc_url)
+        _rpc_latency[rpc_url] = seconds if previous is None else (
+            RPC_LATENCY_ALPHA * seconds + (1 - RPC_LATENCY_ALPHA) * previous
+        )
+
+
+def _rate_limit_wait(response, attempt: int) -> float:
+    """Seconds to wait after a 429: Retry-After if given, else capped exponential backoff (1, 2, 4... 30s).
+
+    Jitter keeps concurrent workers from retrying in lockstep.
     """
-    payload = {"jsonrpc": "2.0", "id": 1, "method": method, "params": params}
+    retry_after = response.headers.get("Retry-After", "")
+    base_wait = float(retry_after) if retry_after.isdigit() else min(2 ** attempt, 30)
+    return base_wait + random.random()
+
+
+def _describe_rpc_error(e: Exception) -> str:
+    """Loggable summary of an RPC failure without the request URL.
+
+    requests/urllib3 errors embed the full URL, which for Helius carries the
+    api-key query parameter.
+    """
+    if isinstance(e, requests.HTTPError) and e.response is not None:
+        return f"HTTP {e.response.status_code}"
+    if isinstance(e, requests.RequestException):
+        return type(e).__name__
+    return str(e)
+
+
+def _post_rpc_once(rpc_url: str, payload):
+    """Single RPC POST that raises on any failure and records endpoint latency.
+
+    Transport and HTTP failures (including 429s) record RPC_FAILURE_PENALTY so a
+    failing endpoint drops behind the other one in the hedging order.
+    """
+    start = time.monotonic()
+    try:
+        response = _SESSION.post(
+            rpc_url,
+            data=_json_dumps(payload),
+            headers={"User-Agent": "Mozilla/5.0", "Content-Type": "application/json"},
+            timeout=30,
+        )
+        response.raise_for_status()
+        body = _json_loads(response.content)
+    except Exception:
+        _record_rpc_latency(rpc_url, RPC_FAILURE_PENALTY)
+        raise
+
+    # A JSON-RPC error still means the endpoint answered, so its latency counts
+    _record_rpc_latency(rpc_url, time.monotonic() - start)
+    if isinstance(body, dict) and "error" in body:
+        raise ValueError(f"RPC Error: {body['error']}")
+    return body
+
+
+def _hedged_rpc_post(payload, rpc_urls: list):
+    """Send to the historically faster endpoint, hedging to the other after a delay.
+
+    Returns the first successful response body, or None if every attempt
+    failed. If none succeeded and one was rate limited, that 429 HTTPError is
+    re-raised so the caller can honor Retry-After before retrying.
+    """
+    with _rpc_latency_lock:
+        # Keep the configured order (primary first) until every endpoint has a
+        # latency sample; the sort is stable, so ties keep that order too
+        if all(url in _rpc_latency for url in rpc_urls):
+            urls = sorted(rpc_urls, key=_rpc_latency.__getitem__)
+        else:
+            urls = list(rpc_urls)
+        delay = max(RPC_HEDGE_MIN_DELAY, RPC_HEDGE_LATENCY_FACTOR * _rpc_latency.get(urls[0], 0.0))
+
+    pending = {_HEDGE_EXECUTOR.submit(_post_rpc_once, urls[0], payload)}
+    done, _ = wait(pending, timeout=delay)
+    if not done:
+        pending.add(_HEDGE_EXECUTOR.submit(_post_rpc_once, urls[1], payload))
+
+    rate_limited = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            try:
+                body = future.result()
+            except requests.HTTPError as e:
+                logger.warning(f"Hedged RPC attempt failed: {_describe_rpc_error(e)}")
+                if e.response is not None and e.response.status_code == 429:
+                    rate_limited = e
+                continue
+            except Exception as e:
+                logger.warning(f"Hedged RPC attempt failed: {_describe_rpc_error(e)}")
+                continue
+            for loser in pending:
+                loser.cancel()  # Only stops it if it hasn't started; otherwise the result is dropped
+            return body
+
+    if rate_limited is not None:
+        raise rate_limited
+    return None
+
+
+def _rpc_post(payload, max_retries: int = 3, use_fallback: bool = True):
+    """POST a JSON-RPC payload (single or batch) with retry logic and fallback.
 
+    Uses the configured RPC_URL (Helius if available) as primary,
+    hedged against the public RPC when it is slow to answer, and falls
+    back to public RPC on repeated failures. Returns the decoded
+    response body, or None if every attempt failed.
+    """
     # Try primary RPC first, then fallback
     rpc_urls = [RPC_URL]
     if use_fallback and RPC_URL != FALLBACK_RPC_URL:
         rpc_urls.append(FALLBACK_RPC_URL)
 
+    # Hedged first attempt; the retry/backoff loop below handles what it can't
+    if RPC_HEDGING and len(rpc_urls) > 1:
+        try:
+            body = _hedged_rpc_post(payload, rpc_urls)
+        except requests.HTTPError as e:
+            # Rate limited: back off before the retry loop hits the endpoint again
+            wait_time = _rate_limit_wait(e.response, 0)
+            logger.warning(f"Rate limited (hedged), waiting {wait_time:.1f}s before retrying")
+            time.sleep(wait_time)
+        else:
+            if body is not None:
+                return body
+
     for rpc_url in rpc_urls:
         rpc_name = "primary" if rpc_url == RPC_URL else "fallback"
 
         for attempt in range(max_retries):
-            req = Request(
-                rpc_url,
-                data=json.dumps(payload).encode("utf-8"),
-                headers={"Content-Type": "application/json", "User-Agent": "Mozilla/5.0"}
-            )
             try:
-                with urlopen(req, timeout=30) as response:
-                    result = json.loads(response.read().decode("utf-8"))
-                    if "error" in result:
-                        logger.error(f"RPC Error ({rpc_name}): {result['error']}")
-                        break  # Try fallback
-                    return result.get("result", {})
-            except HTTPError as e:
-                if e.code == 429:
-                    wait_time = 2 ** attempt  # Exponential backoff: 1, 2, 4 seconds
-                    logger.warning(f"Rate limited ({rpc_name}), waiting {wait_time}s (attempt {attempt + 1}/{max_retries})")
+                response = _SESSION.post(
+                    rpc_url,
+                    data=_json_dumps(payload),
+                    headers={"User-Agent": "Mozilla/5.0", "Content-Type": "application/json"},
+                    timeout=30,
+                )
+                response.raise_for_status()
+                body = _json_loads(response.content)
+                if isinstance(body, dict) and "error" in body:
+                    logger.error(f"RPC Error ({rpc_name}): {body['error']}")
+                    break  # Try fallback
+                return body
+            except requests.HTTPError as e:
+                status_code = e.response.status_code
+                if status_code == 429:
+                    wait_time = _rate_limit_wait(e.response, attempt)
+                    logger.warning(f"Rate limited ({rpc_name}), waiting {wait_time:.1f}s (attempt {attempt + 1}/{max_retries})")
                     time.sleep(wait_time)
                     continue
-                logger.error(f"HTTP error ({rpc_name}) {e.code}: {e.reason}")
+                logger.error(f"HTTP error ({rpc_name}) {status_code}: {e.response.reason}")
                 if attempt < max_retries - 1:
                     time.sleep(2 ** attempt)
                     continue
                 break  # Try fallback
             except Exception as e:
-                logger.error(f"RPC call failed ({rpc_name}): {e}")
+                logger.error(f"RPC call failed ({rpc_name}): {_describe_rpc_error(e)}")
                 if attempt < max_retries - 1:
                     time.sleep(2 ** attempt)
                     continue
@@ -215,7 +402,42 @@ def rpc_call(method: str, params: list, max_retries: int = 3, use_fallback: bool
         if rpc_url == RPC_URL and len(rpc_urls) > 1:
             logger.info(f"Primary RPC failed, trying fallback...")
 
-    return {}
+    return None
+
+
+def rpc_call(method: str, params: list, max_retries: int = 3, use_fallback: bool = True) -> dict:
+    """Make an RPC call to the Solana node with retry logic and fallback."""
+    payload = {"jsonrpc": "2.0", "id": 1, "method": method, "params": params}
+    body = _rpc_post(payload, max_retries, use_fallback)
+    if body is None:
+        return {}
+    return body.get("result", {})
+
+
+def rpc_batch_call(calls: list, max_retries: int = 3, use_fallback: bool = True):
+    """Send several RPC calls as one JSON-RPC 2.0 batch request.
+
+    `calls` is a list of (method, params) tuples. Returns the results in the
+    same order, with None for calls that errored, or None if the batch
+    request itself failed.
+    """
+    payload = [
+        {"jsonrpc": "2.0", "id": i, "method": method, "params": params}
+        for i, (method, params) in enumerate(calls)
+    ]
+    body = _rpc_post(payload, max_retries, use_fallback)
+    if not isinstance(body, list):
+        return None
+
+    results = [None] * len(calls)
+    for item in body:
+        idx = item.get("id")
+        if isinstance(idx, int) and 0 <= idx < len(calls):
+            if "error" in item:
+                logger.error(f"RPC Error (batch item {idx}): {item['error']}")
+            else:
+                results[idx] = item.get("result")
+    return results
 
 
 def run_dune_query(sql: str, timeout: int = 180, max_retries: int = 3) -> dict:
@@ -230,21 +452,21 @@ def run_dune_query(sql: str, timeout: int = 180, max_retries: int = 3) -> dict:
 
     url = f"{DUNE_API_URL}/sql/execute"
     payload = {"sql": sql, "performance": "medium"}
+    headers = {"X-DUNE-API-KEY": DUNE_API_KEY}
 
     # Start query execution with retry
     execution_id = None
     for attempt in range(max_retries):
-        req = Request(
-            url,
-            data=json.dumps(payload).encode("utf-8"),
-            headers={"Content-Type": "application/json", "X-DUNE-API-KEY": DUNE_API_KEY},
-            method="POST"
-        )
         try:
-            with urlopen(req, timeout=30) as response:
-                result = json.loads(response.read().decode("utf-8"))
-                execution_id = result.get("execution_id")
-                break
+            response = _SESSION.post(
+                url,
+                data=_json_dumps(payload),
+                headers={**headers, "Content-Type": "application/json"},
+                timeout=30,
+            )
+            response.raise_for_status()
+            execution_id = _json_loads(response.content).get("execution_id")
+            break
         except Exception as e:
             if attempt < max_retries - 1:
                 wait_time = 2 ** attempt
@@ -258,31 +480,33 @@ def run_dune_query(sql: str, timeout: int = 180, max_retries: int = 3) -> dict:
         _dune_circuit_breaker.record_failure()
         return {"error": "Failed to start query"}
 
-    # Poll for results
-    start_time = time.time()
-    while time.time() - start_time < timeout:
+    # Poll for results, starting fast and backing off (0.5s -> 1s -> 2s -> 4s -> 5s)
+    start_time = time.monotonic()
+    poll_interval = 0.5
+    while time.monotonic() - start_time < timeout:
         status_url = f"{DUNE_API_URL}/execution/{execution_id}/status"
-        req = Request(status_url, headers={"X-DUNE-API-KEY": DUNE_API_KEY})
 
         try:
-            with urlopen(req, timeout=30) as response:
-                status = json.loads(response.read().decode("utf-8"))
-                state = status.get("state", "")
-
-                if status.get("is_execution_finished") or state == "QUERY_STATE_COMPLETED":
-                    results_url = f"{DUNE_API_URL}/execution/{execution_id}/results"
-                    req = Request(results_url, headers={"X-DUNE-API-KEY": DUNE_API_KEY})
-                    with urlopen(req, timeout=30) as response:
-                        _dune_circuit_breaker.record_success()
-                        return json.loads(response.read().decode("utf-8"))
-                elif "FAILED" in state:
-                    _dune_circuit_breaker.record_failure()
-                    return {"error": status.get("error", {}).get("message", str(status))}
+            response = _SESSION.get(status_url, headers=headers, timeout=30)
+            response.raise_for_status()
+            status = _json_loads(response.content)
+            state = status.get("state", "")
+
+            if status.get("is_execution_finished") or state == "QUERY_STATE_COMPLETED":
+                results_url = f"{DUNE_API_URL}/execution/{execution_id}/results"
+                response = _SESSION.get(results_url, headers=headers, timeout=30)
+                response.raise_for_status()
+                _dune_circuit_breaker.record_success()
+                return _json_loads(response.content)
+            elif "FAILED" in state:
+                _dune_circuit_breaker.record_failure()
+                return {"error": status.get("error", {}).get("message", str(status))}
         except Exception as e:
             _dune_circuit_breaker.record_failure()
             return {"error": str(e)}
 
-        time.sleep(5)
+        time.sleep(poll_interval)
+        poll_interval = min(poll_interval * 2, 5)
 
     _dune_circuit_breaker.record_failure()
     return {"error": "Query timeout"}
@@ -302,6 +526,13 @@ def format_timestamp(dt: datetime) -> str:
     return f"TIMESTAMP '{dt.strftime('%Y-%m-%d %H:%M:%S')}'"
 
 
+def distinct_count_sql(column: str) -> str:
+    """Return a distinct-count SQL expression (approximate unless DUNE_EXACT_COUNTS is set)."""
+    if DUNE_EXACT_COUNTS:
+        return f"COUNT(DISTINCT {column})"
+    return f"APPROX_DISTINCT({column})"
+
+
 def run_dune_query_safe(sql: str, timeout: int = 180):
     """Run Dune query with error handling. Returns (rows, error)."""
     result = run_dune_query(sql, timeout=timeout)
@@ -311,27 +542,61 @@ def run_dune_query_safe(sql: str, timeout: int = 180):
     return rows, None
 
 
+def iter_defillama_protocols():
+    """Yield protocol entries from the DeFiLlama derivatives overview.
+
+    Streams the "protocols" array with ijson when it is installed, otherwise
+    parses the whole response.
+    """
+    response = _SESSION.get(
+        DEFILLAMA_URL,
+        params=DEFILLAMA_PARAMS,
+        headers={"User-Agent": "Mozilla/5.0"},
+        timeout=30,
+        stream=ijson is not None,
+    )
+    response.raise_for_status()
+
+    if ijson is None:
+        yield from _json_loads(response.content).get("protocols", [])
+        return
+
+    response.raw.decode_content = True  # Let urllib3 undo gzip for ijson
+    try:
+        yield from ijson.items(response.raw, "protocols.item", use_float=True)
+    finally:
+        response.close()
+
+
+DEFILLAMA_CACHE_SECONDS = 300
+
+
+@functools.lru_cache(maxsize=4)
+def _fetch_defillama_volume_cached(bucket: int) -> dict:
+    """Fetch Solana protocol volumes once per time bucket (errors are not cached)."""
+    volumes = {}
+    for protocol in iter_defillama_protocols():
+        if "Solana" in protocol.get("chains", []):
+            volumes[protocol.get("name", "")] = {
+                "volume_24h": protocol.get("total24h", 0) or 0,
+                "volume_7d": protocol.get("total7d", 0) or 0,
+                "volume_30d": protocol.get("total30d", 0) or 0,
+                "change_1d": protocol.get("change_1d", 0) or 0,
+                "change_7d": protocol.get("change_7d", 0) or 0,
+                "change_1m": protocol.get("change_1m", 0) or 0,
+            }
+    return volumes
+
+
 def fetch_defillama_volume() -> dict:
-    """Fetch volume data from DeFiLlama derivatives overview."""
+    """Fetch volume data from DeFiLlama derivatives overview.
+
+    Results are shared in-process for DEFILLAMA_CACHE_SECONDS.
+    """
     logger.info("Fetching volume from DeFiLlama...")
 
     try:
-        req = Request(DEFILLAMA_URL, headers={"User-Agent": "Mozilla/5.0"})
-        with urlopen(req, timeout=30) as response:
-            data = json.loads(response.read().decode("utf-8"))
-
-        volumes = {}
-        for protocol in data.get("protocols", []):
-            if "Solana" in protocol.get("chains", []):
-                volumes[protocol.get("name", "")] = {
-                    "volume_24h": protocol.get("total24h", 0) or 0,
-                    "volume_7d": protocol.get("total7d", 0) or 0,
-                    "volume_30d": protocol.get("total30d", 0) or 0,
-                    "change_1d": protocol.get("change_1d", 0) or 0,
-                    "change_7d": protocol.get("change_7d", 0) or 0,
-                    "change_1m": protocol.get("change_1m", 0) or 0,
-                }
-
+        volumes = _fetch_defillama_volume_cached(int(time.time()) // DEFILLAMA_CACHE_SECONDS)
         logger.info(f"Found {len(volumes)} protocols")
         return volumes
     except Exception as e:
@@ -344,28 +609,23 @@ def fetch_global_derivatives() -> list:
     logger.info("Fetching global derivatives...")
 
     try:
-        req = Request(DEFILLAMA_URL, headers={"User-Agent": "Mozilla/5.0"})
-        with urlopen(req, timeout=30) as response:
-            data = json.loads(response.read().decode("utf-8"))
-
         protocols = []
-        for protocol in data.get("protocols", []):
+        for protocol in iter_defillama_protocols():
             vol_24h = protocol.get("total24h", 0) or 0
             if vol_24h > 1000000:  # Only include protocols with >$1M volume
+                # Keep only the fields the Cross-Chain section reads; this list
+                # is stored in cache.json and loaded by every app worker
                 protocols.append({
                     "name": protocol.get("name", ""),
                     "chains": protocol.get("chains", []),
                     "volume_24h": vol_24h,
-                    "volume_7d": protocol.get("total7d", 0) or 0,
                     "change_1d": protocol.get("change_1d", 0) or 0,
                     "change_7d": protocol.get("change_7d", 0) or 0,
                 })
 
-        # Sort by 24h volume descending
-        protocols.sort(key=lambda x: x["volume_24h"], reverse=True)
-
         logger.info(f"Found {len(protocols)} protocols")
-        return protocols[:15]  # Top 15
+        # Top 15 by 24h volume, descending
+        return heapq.nlargest(15, protocols, key=operator.itemgetter("volume_24h"))
     except Exception as e:
         logger.error(f"Failed: {e}")
         return []
@@ -408,12 +668,13 @@ def fetch_pacifica_traders_from_api() -> dict:
     """
     logger.info("Fetching Pacifica traders from leaderboard API...")
     try:
-        req = Request(
+        response = _SESSION.get(
             "https://app.pacifica.fi/api/v1/leaderboard",
-            headers={"User-Agent": "SolanaPerpsBot/1.0"}
+            headers={"User-Agent": "SolanaPerpsBot/1.0"},
+            timeout=30,
         )
-        with urlopen(req, timeout=30) as resp:
-            data = json.loads(resp.read().decode())
+        response.raise_for_status()
+        data = _json_loads(response.content)
 
         if not data.get("success") or "data" not in data:
             logger.warning("Pacifica API returned unexpected format")
@@ -486,12 +747,13 @@ def fetch_pacifica_pnl_leaderboard(limit: int = 100) -> dict:
     """
     logger.info("Fetching Pacifica P&L leaderboard...")
     try:
-        req = Request(
+        response = _SESSION.get(
             "https://app.pacifica.fi/api/v1/leaderboard",
-            headers={"User-Agent": "SolanaPerpsBot/1.0"}
+            headers={"User-Agent": "SolanaPerpsBot/1.0"},
+            timeout=30,
         )
-        with urlopen(req, timeout=30) as resp:
-            data = json.loads(resp.read().decode())
+        response.raise_for_status()
+        data = _json_loads(response.content)
 
         if not data.get("success") or "data" not in data:
             logger.warning("Pacifica API returned unexpected format")
@@ -519,11 +781,11 @@ def fetch_pacifica_pnl_leaderboard(limit: int = 100) -> dict:
                     "equity": float(t.get("equity_current", 0)),
                 })
 
-        # Sort by 24h P&L for winners (highest first) and losers (lowest first)
-        sorted_by_pnl = sorted(pnl_data, key=lambda x: x["pnl_24h"], reverse=True)
-
-        top_winners = [t for t in sorted_by_pnl if t["pnl_24h"] > 0][:limit]
-        top_losers = [t for t in sorted_by_pnl if t["pnl_24h"] < 0][-limit:][::-1]  # Most negative first
+        # Top winners (highest 24h P&L first) and losers (most negative first),
+        # selected without sorting every trader
+        pnl_key = operator.itemgetter("pnl_24h")
+        top_winners = heapq.nlargest(limit, (t for t in pnl_data if t["pnl_24h"] > 0), key=pnl_key)
+        top_losers = heapq.nsmallest(limit, (t for t in pnl_data if t["pnl_24h"] < 0), key=pnl_key)
 
         logger.info(f"Pacifica P&L: {len(top_winners)} winners, {len(top_losers)} losers (top {limit})")
         return {
@@ -547,24 +809,26 @@ def fetch_pacifica_markets() -> dict:
 
     try:
         # Fetch market info (funding rates, leverage, etc.)
-        req = Request(
+        response = _SESSION.get(
             "https://api.pacifica.fi/api/v1/info",
-            headers={"User-Agent": "Mozilla/5.0", "Accept": "application/json"}
+            headers={"User-Agent": "Mozilla/5.0", "Accept": "application/json"},
+            timeout=30,
         )
-        with urlopen(req, timeout=30) as response:
-            info_result = json.loads(response.read().decode("utf-8"))
+        response.raise_for_status()
+        info_result = _json_loads(response.content)
 
         if not info_result.get("success") or "data" not in info_result:
             logger.warning("Pacifica info API returned unexpected format")
             return {}
 
         # Fetch leaderboard for volume aggregation
-        req2 = Request(
+        response = _SESSION.get(
             "https://app.pacifica.fi/api/v1/leaderboard",
-            headers={"User-Agent": "Mozilla/5.0", "Accept": "application/json"}
+            headers={"User-Agent": "Mozilla/5.0", "Accept": "application/json"},
+            timeout=30,
         )
-        with urlopen(req2, timeout=30) as response:
-            lb_result = json.loads(response.read().decode("utf-8"))
+        response.raise_for_status()
+        lb_result = _json_loads(response.content)
 
         # Calculate total 24h volume from top traders
         total_volume_24h = 0
@@ -626,9 +890,9 @@ def fetch_jupiter_pnl_leaderboard(limit: int = 50) -> dict:
         for market_name, market_address in JUPITER_PNL_MARKETS.items():
             try:
                 url = f"https://perps-api.jup.ag/v1/top-traders?marketMint={market_address}&week=current&year={current_year}"
-                req = Request(url, headers={"User-Agent": "SolanaPerpsBot/1.0"})
-                with urlopen(req, timeout=30) as resp:
-                    data = json.loads(resp.read().decode())
+                response = _SESSION.get(url, headers={"User-Agent": "SolanaPerpsBot/1.0"}, timeout=30)
+                response.raise_for_status()
+                data = _json_loads(response.content)
 
                 # Extract top traders by PnL from response
                 traders = data.get("topTradersByPnl", [])
@@ -660,12 +924,11 @@ def fetch_jupiter_pnl_leaderboard(limit: int = 50) -> dict:
                 logger.warning(f"Jupiter {market_name} P&L fetch failed: {e}")
                 continue
 
-        # Convert to list and sort by P&L
+        # Top winners and losers by weekly P&L, selected without sorting every trader
         traders_list = list(all_traders.values())
-        sorted_by_pnl = sorted(traders_list, key=lambda x: x["pnl_weekly"], reverse=True)
-
-        top_winners = [t for t in sorted_by_pnl if t["pnl_weekly"] > 0][:limit]
-        top_losers = [t for t in sorted_by_pnl if t["pnl_weekly"] < 0][-limit:][::-1]
+        pnl_key = operator.itemgetter("pnl_weekly")
+        top_winners = heapq.nlargest(limit, (t for t in traders_list if t["pnl_weekly"] > 0), key=pnl_key)
+        top_losers = heapq.nsmallest(limit, (t for t in traders_list if t["pnl_weekly"] < 0), key=pnl_key)
 
         logger.info(f"Jupiter P&L: {len(top_winners)} winners, {len(top_losers)} losers across {len(JUPITER_PNL_MARKETS)} markets")
         return {
@@ -929,9 +1192,9 @@ def fetch_drift_markets_from_api() -> dict:
     logger.info("Fetching Drift markets from API...")
 
     try:
-        req = Request(DRIFT_DATA_API, headers={"User-Agent": "Mozilla/5.0"})
-        with urlopen(req, timeout=30) as response:
-            data = json.loads(response.read().decode("utf-8"))
+        response = _SESSION.get(DRIFT_DATA_API, headers={"User-Agent": "Mozilla/5.0"}, timeout=30)
+        response.raise_for_status()
+        data = _json_loads(response.content)
 
         contracts = data.get("contracts", data) if isinstance(data, dict) else data
 
@@ -1006,7 +1269,7 @@ def fetch_drift_accurate_traders(hours: int = 1) -> int:
           -- Filter for trading-related instructions by checking common patterns
           -- Account argument patterns: [state, user, user_stats, ...]
     )
-    SELECT COUNT(DISTINCT user_account) as unique_users
+    SELECT {distinct_count_sql("user_account")} as unique_users
     FROM trade_instructions
     WHERE user_account NOT IN ('{keeper_list}')
       AND user_account NOT LIKE 'Sysvar%'
@@ -1032,11 +1295,10 @@ def fetch_drift_market_breakdown(hours: int = 1) -> dict:
     """Fetch Drift market breakdown with trade counts from Dune."""
     logger.info("Fetching Drift markets from Dune...")
 
-    case_parts = [f"WHEN CONTAINS(account_keys, '{acc}') THEN '{mkt}'" for acc, mkt in DRIFT_MARKET_ACCOUNTS.items()]
     start, end = get_time_range(hours)
 
     sql = f"""
-    SELECT CASE {' '.join(case_parts)} ELSE 'OTHER' END as market, COUNT(*) as tx_count
+    SELECT CASE {DRIFT_CASE_STMT} ELSE 'OTHER' END as market, COUNT(*) as tx_count
     FROM solana.transactions
     WHERE block_time >= {format_timestamp(start)} AND block_time < {format_timestamp(end)}
       AND CONTAINS(account_keys, 'dRiftyHA39MWEi3m9aunc5MzRF1JYuBsbn6VPcn33UH')
@@ -1068,7 +1330,7 @@ def fetch_jupiter_accurate_traders(hours: int = 1) -> int:
     custody_check = " OR ".join([f"CONTAINS(account_keys, '{acc}')" for acc in custody_accounts])
 
     sql = f"""
-    SELECT COUNT(*) as total_txns, COUNT(DISTINCT signer) as unique_traders
+    SELECT COUNT(*) as total_txns, {distinct_count_sql("signer")} as unique_traders
     FROM solana.transactions
     WHERE block_time >= {format_timestamp(start)} AND block_time < {format_timestamp(end)}
       AND CONTAINS(account_keys, 'PERPHjGBqRHArX4DySjwM6UJHiR3sWAatqfdBS2qQJu')
@@ -1116,7 +1378,7 @@ def fetch_pacifica_traders(hours: int = 1) -> int:
 
     start, end = get_time_range(hours)
     sql = f"""
-    SELECT COUNT(*) as total_txns, COUNT(DISTINCT signer) as unique_traders
+    SELECT COUNT(*) as total_txns, {distinct_count_sql("signer")} as unique_traders
     FROM solana.transactions
     WHERE block_time >= {format_timestamp(start)} AND block_time < {format_timestamp(end)}
       AND CONTAINS(account_keys, 'PCFA5iYgmqK6MqPhWNKg7Yv7auX7VZ4Cx7T1eJyrAMH')
@@ -1141,7 +1403,7 @@ def fetch_flashtrade_traders(hours: int = 1) -> int:
 
     start, end = get_time_range(hours)
     sql = f"""
-    SELECT COUNT(*) as total_txns, COUNT(DISTINCT signer) as unique_traders
+    SELECT COUNT(*) as total_txns, {distinct_count_sql("signer")} as unique_traders
     FROM solana.transactions
     WHERE block_time >= {format_timestamp(start)} AND block_time < {format_timestamp(end)}
       AND CONTAINS(account_keys, 'FLASH6Lo6h3iasJKWDs2F8TkW2UKf3s15C8PMGuVfgBn')
@@ -1167,7 +1429,7 @@ def fetch_adrena_traders(hours: int = 1) -> int:
 
     start, end = get_time_range(hours)
     sql = f"""
-    SELECT COUNT(*) as total_txns, COUNT(DISTINCT signer) as unique_traders
+    SELECT COUNT(*) as total_txns, {distinct_count_sql("signer")} as unique_traders
     FROM solana.transactions
     WHERE block_time >= {format_timestamp(start)} AND block_time < {format_timestamp(end)}
       AND CONTAINS(account_keys, '13gDzEXCdocbj8iAiqrScGo47NiSuYENGsRqi3SEAwet')
@@ -1191,11 +1453,10 @@ def fetch_jupiter_market_breakdown(hours: int = 1) -> dict:
     """Fetch Jupiter Perps market breakdown with trade counts from Dune."""
     logger.info("Fetching Jupiter markets from Dune...")
 
-    case_parts = [f"WHEN CONTAINS(account_keys, '{acc}') THEN '{mkt}'" for acc, mkt in JUPITER_CUSTODY_ACCOUNTS.items()]
     start, end = get_time_range(hours)
 
     sql = f"""
-    SELECT CASE {' '.join(case_parts)} ELSE 'OTHER' END as market, COUNT(*) as tx_count
+    SELECT CASE {JUPITER_CASE_STMT} ELSE 'OTHER' END as market, COUNT(*) as tx_count
     FROM solana.transactions
     WHERE block_time >= {format_timestamp(start)} AND block_time < {format_timestamp(end)}
       AND CONTAINS(account_keys, 'PERPHjGBqRHArX4DySjwM6UJHiR3sWAatqfdBS2qQJu')
@@ -1212,41 +1473,196 @@ def fetch_jupiter_market_breakdown(hours: int = 1) -> dict:
     return markets
 
 
+SIGNATURE_CHECKPOINTS_PATH = "data/signature_checkpoints.json"
+SIGNATURE_BUCKET_SECONDS = 60
+SIGNATURE_MAX_PAGES = 20
+
+# Per-program signature checkpoints, shared by update_cache.py's worker threads
+_signature_checkpoints_lock = threading.Lock()
+
+
+def load_signature_checkpoints() -> dict:
+    """Load per-program signature checkpoints saved by previous runs."""
+    try:
+        with open(SIGNATURE_CHECKPOINTS_PATH, "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _signature_checkpoint_key(program_id: str, hours: int) -> str:
+    """Checkpoints are per program and window: buckets are pruned to the window they were counted for."""
+    return f"{program_id}:{hours}h"
+
+
+def save_signature_checkpoint(checkpoint_key: str, checkpoint: dict):
+    """Merge one program/window checkpoint into the checkpoints file."""
+    with _signature_checkpoints_lock:
+        checkpoints = load_signature_checkpoints()
+        checkpoints[checkpoint_key] = checkpoint
+        # Drop the pre-window entry keyed by program id alone
+        checkpoints.pop(checkpoint_key.split(":")[0], None)
+        try:
+            os.makedirs(os.path.dirname(SIGNATURE_CHECKPOINTS_PATH), exist_ok=True)
+            with open(SIGNATURE_CHECKPOINTS_PATH, "w") as f:
+                json.dump(checkpoints, f)
+        except OSError as e:
+            logger.warning(f"Failed to save signature checkpoint: {e}")
+
+
+def _new_signature_scan(program_id: str, checkpoint_key: str, checkpoint: dict) -> dict:
+    """Start paging state for one program, resuming from its checkpoint."""
+    return {
+        "program_id": program_id,
+        "checkpoint_key": checkpoint_key,
+        "checkpoint": checkpoint,
+        "until": checkpoint.get("newest_signature"),
+        "before": None,
+        "newest": None,
+        "buckets": {},
+        "pages": 0,
+        "reached_end": False,
+        "done": False,
+    }
+
+
+def _signature_page_params(scan: dict) -> list:
+    """getSignaturesForAddress params for the next page of a scan."""
+    options = {"limit": 1000}
+    if scan["before"]:
+        options["before"] = scan["before"]
+    if scan["until"]:
+        options["until"] = scan["until"]
+    return [scan["program_id"], options]
+
+
+def _add_signature_page(scan: dict, result, cutoff_time: int):
+    """Bucket one page of signatures into a scan and mark it done when finished."""
+    scan["pages"] += 1
+    if not result or not isinstance(result, list):
+        scan["reached_end"] = result == []
+        scan["done"] = True
+        return
+
+    if scan["newest"] is None:
+        scan["newest"] = result[0].get("signature")
+
+    buckets = scan["buckets"]
+    for sig_info in result:
+        sig_time = sig_info.get("blockTime", 0)
+        if sig_time and sig_time < cutoff_time:
+            scan["reached_end"] = True
+            break
+        if sig_info.get("err") is None and sig_time:
+            bucket = str(sig_time - sig_time % SIGNATURE_BUCKET_SECONDS)
+            buckets[bucket] = buckets.get(bucket, 0) + 1
+
+    if scan["reached_end"] or len(result) < 1000:
+        scan["reached_end"] = True
+        scan["done"] = True
+    elif scan["pages"] >= SIGNATURE_MAX_PAGES:
+        scan["done"] = True
+    else:
+        scan["before"] = result[-1].get("signature")
+
+
+def _finish_signature_scan(scan: dict, cutoff_time: int) -> int:
+    """Merge a finished scan into its checkpoint, save it and return the count.
+
+    The checkpoint only moves forward after a complete scan, one that paged
+    back to the previous checkpoint or the window cutoff. A scan cut short by
+    the page cap or an RPC failure still counts for this run, but the previous
+    checkpoint is kept so the next run pages over the skipped signatures again.
+    """
+    until_sig = scan["until"]
+    min_bucket = cutoff_time - cutoff_time % SIGNATURE_BUCKET_SECONDS
+
+    # Old buckets cover everything up to the previous checkpoint's signature
+    old_buckets = {
+        b: c for b, c in scan["checkpoint"].get("buckets", {}).items() if int(b) >= min_bucket
+    } if until_sig else {}
+
+    buckets = dict(old_buckets)
+    for bucket, bucket_count in scan["buckets"].items():
+        if int(bucket) >= min_bucket:
+            buckets[bucket] = buckets.get(bucket, 0) + bucket_count
+
+    if scan["reached_end"]:
+        if scan["newest"] or buckets:
+            save_signature_checkpoint(scan["checkpoint_key"], {
+                "newest_signature": scan["newest"] or until_sig,
+                "buckets": buckets,
+            })
+    elif until_sig:
+        # Incomplete scan: keep the previous checkpoint, only pruned to the window
+        save_signature_checkpoint(scan["checkpoint_key"], {
+            "newest_signature": until_sig,
+            "buckets": old_buckets,
+        })
+
+    return sum(buckets.values())
+
+
 def fetch_signature_count(program_id: str, hours: int = 24) -> int:
-    """Count recent signatures for a program."""
+    """Count recent signatures for a program.
+
+    Successful signatures are kept as per-minute counts in
+    SIGNATURE_CHECKPOINTS_PATH along with the newest signature seen (per
+    program and window), so later runs only page back to that signature (via
+    `until`) instead of re-reading the whole window.
+    """
     if not program_id:
         return 0
 
     cutoff_time = int((datetime.now() - timedelta(hours=hours)).timestamp())
-    count = 0
-    last_sig = None
 
-    for _ in range(20):  # Max iterations
-        params = [program_id, {"limit": 1000}]
-        if last_sig:
-            params[1]["before"] = last_sig
+    checkpoint_key = _signature_checkpoint_key(program_id, hours)
+    with _signature_checkpoints_lock:
+        checkpoint = load_signature_checkpoints().get(checkpoint_key) or {}
+    scan = _new_signature_scan(program_id, checkpoint_key, checkpoint)
 
-        result = rpc_call("getSignaturesForAddress", params)
-        if not result or not isinstance(result, list):
-            break
+    while not scan["done"]:
+        result = rpc_call("getSignaturesForAddress", _signature_page_params(scan))
+        _add_signature_page(scan, result, cutoff_time)
+        if not scan["done"]:
+            time.sleep(0.1)
 
-        for sig_info in result:
-            sig_time = sig_info.get("blockTime", 0)
-            if sig_time and sig_time < cutoff_time:
-                return count
-            if sig_info.get("err") is None:
-                count += 1
+    return _finish_signature_scan(scan, cutoff_time)
 
-        if result:
-            last_sig = result[-1].get("signature")
-            if result[-1].get("blockTime", 0) < cutoff_time:
-                break
-        else:
-            break
 
-        time.sleep(0.1)
+def fetch_signature_counts_batch(program_ids: list, hours: int = 24) -> dict:
+    """Count recent signatures for several programs, one batched RPC request per page.
 
-    return count
+    Same counting and checkpointing as fetch_signature_count, but each round
+    of getSignaturesForAddress calls goes out as a single JSON-RPC batch.
+    Returns {program_id: count}.
+    """
+    cutoff_time = int((datetime.now() - timedelta(hours=hours)).timestamp())
+
+    with _signature_checkpoints_lock:
+        checkpoints = load_signature_checkpoints()
+    scans = {}
+    for program_id in program_ids:
+        if program_id:
+            checkpoint_key = _signature_checkpoint_key(program_id, hours)
+            scans[program_id] = _new_signature_scan(program_id, checkpoint_key, checkpoints.get(checkpoint_key) or {})
+
+    pending = list(scans.values())
+    while pending:
+        calls = [("getSignaturesForAddress", _signature_page_params(scan)) for scan in pending]
+        results = rpc_batch_call(calls)
+        if results is None:
+            # Batch rejected (some providers disable batching): send this round individually
+            results = [rpc_call(method, params) for method, params in calls]
+
+        for scan, result in zip(pending, results):
+            _add_signature_page(scan, result, cutoff_time)
+
+        pending = [scan for scan in pending if not scan["done"]]
+        if pending:
+            time.sleep(0.1)
+
+    return {program_id: _finish_signature_scan(scan, cutoff_time) for program_id, scan in scans.items()}
 
 
 # --- Whale Wallet Monitoring via RPC ---
@@ -1322,6 +1738,7 @@ def fetch_whale_activity(max_whales: int = 10, txns_per_whale: int = 5) -> dict:
     whales = get_top_whale_addresses(limit=max_whales * 2)[:max_whales]
     whale_activity = []
     active_count = 0
+    txn_count_1h = 0
     cutoff_time = datetime.utcnow() - timedelta(hours=1)
 
     for whale in whales:
@@ -1336,6 +1753,7 @@ def fetch_whale_activity(max_whales: int = 10, txns_per_whale: int = 5) -> dict:
         is_active = len(recent_activity) > 0
         if is_active:
             active_count += 1
+        txn_count_1h += len(recent_activity)
 
         whale_activity.append({
             "address": addr,
@@ -1355,6 +1773,7 @@ def fetch_whale_activity(max_whales: int = 10, txns_per_whale: int = 5) -> dict:
         "whales": whale_activity,
         "total_whales": len(whale_activity),
         "active_last_1h": active_count,
+        "txn_count_1h": txn_count_1h,
         "timestamp": datetime.utcnow().isoformat() + "Z",
     }
 
@@ -1565,32 +1984,75 @@ def calculate_market_fees(market_volumes: dict, fee_rate: float) -> dict:
 
 
 def collect_all_data(hours: int = 24, fetch_markets: bool = True) -> tuple:
-    """Collect data for all protocols."""
-    defillama_volumes = fetch_defillama_volume()
+    """Collect data for all protocols.
+
+    Every fetch is independent I/O, so they all run concurrently and wall
+    time is roughly that of the slowest one.
+    """
+    fetches = {
+        "defillama": fetch_defillama_volume,
+        "drift_traders": lambda: fetch_drift_accurate_traders(hours=6),  # 6h sample, more reliable
+        "jupiter_traders": lambda: fetch_jupiter_accurate_traders(hours=6),  # 6h sample
+    }
+    if fetch_markets:
+        fetches["drift_markets"] = fetch_drift_markets_from_api
+        fetches["jupiter_markets"] = lambda: fetch_jupiter_market_breakdown(hours=1)
+
+    program_ids = {
+        name: metadata["program_id"]
+        for name, metadata in PROTOCOL_METADATA.items()
+        if metadata.get("program_id")
+    }
+    fetches["tx_counts"] = lambda: fetch_signature_counts_batch(list(program_ids.values()), hours)
+
+    results = {}
+    logger.info("Fetching volumes, trader counts and tx counts in parallel...")
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        future_to_name = {executor.submit(fn): name for name, fn in fetches.items()}
+        for future in as_completed(future_to_name):
+            name = future_to_name[future]
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                logger.error(f"{name} failed: {e}")
+
+    counts_by_program = results.get("tx_counts", {})
+    tx_counts = {name: counts_by_program.get(pid, 0) for name, pid in program_ids.items()}
+    defillama_volumes = results.get("defillama", {})
+    drift_24h_traders = results.get("drift_traders", 0)
+    jupiter_24h_traders = results.get("jupiter_traders", 0)
 
     all_metrics = []
+    metrics_by_protocol = {}
     market_breakdowns = {}
 
-    # First, fetch accurate 24h trader counts for protocols with program IDs
-    logger.info("Fetching accurate 24h trader counts...")
-    drift_24h_traders = fetch_drift_accurate_traders(hours=6)  # 6h sample, more reliable
-    jupiter_24h_traders = fetch_jupiter_accurate_traders(hours=6)  # 6h sample
-
     # Build protocol metrics dynamically from DeFiLlama data
     for protocol_name, volume_data in defillama_volumes.items():
         volume_24h = volume_data.get("volume_24h", 0)
         if volume_24h < 1000:  # Skip tiny protocols
             continue
 
-        logger.info(f"Processing {protocol_name}...")
-
         # Get extra metadata if available
         metadata = PROTOCOL_METADATA.get(protocol_name, {})
         program_id = metadata.get("program_id")
         fee_rate = metadata.get("fee_rate", 0.0005)  # Default 0.05%
 
-        # Get tx count from RPC if we have program ID
-        tx_count = fetch_signature_count(program_id, hours) if program_id else 0
+        # DeFiLlama-only protocols: no RPC or Dune data to fetch
+        if program_id is None:
+            metrics = {
+                "protocol": protocol_name,
+                "transactions": 0,
+                "traders": 0,
+                "volume_usd": volume_24h,
+                "fees_usd": volume_24h * fee_rate,
+            }
+            all_metrics.append(metrics)
+            metrics_by_protocol[protocol_name] = metrics
+            continue
+
+        logger.info(f"Processing {protocol_name}...")
+
+        tx_count = tx_counts.get(protocol_name, 0)
 
         # Use accurate trader counts for known protocols
         if protocol_name == "Drift Trade":
@@ -1612,18 +2074,22 @@ def collect_all_data(hours: int = 24, fetch_markets: bool = True) -> tuple:
 
         logger.info(f"{tx_count:,} txns, ${volume_24h:,.0f} vol")
         all_metrics.append(metrics)
+        metrics_by_protocol[protocol_name] = metrics
+
+    drift_cfg = PROTOCOL_METADATA["Drift Trade"]
+    jupiter_cfg = PROTOCOL_METADATA["Jupiter Perpetual Exchange"]
 
     # Fetch market breakdowns for both protocols
     if fetch_markets:
         print()
 
         # Drift market breakdown from API (actual per-market volumes)
-        drift_markets = fetch_drift_markets_from_api()
+        drift_markets = results.get("drift_markets", {})
         # Use the 6h trader count we already fetched
         drift_accurate_traders = drift_24h_traders
 
         if drift_markets:
-            drift_fee_rate = PROTOCOL_METADATA["Drift Trade"]["fee_rate"]
+            drift_fee_rate = drift_cfg["fee_rate"]
 
             # Use actual volumes from API and calculate fees
             drift_volumes = {m: data["volume"] for m, data in drift_markets.items()}
@@ -1647,15 +2113,14 @@ def collect_all_data(hours: int = 24, fetch_markets: bool = True) -> tuple:
             }
 
         # Jupiter Perps market breakdown with accurate trader count
-        jupiter_trade_counts = fetch_jupiter_market_breakdown(hours=1)
+        jupiter_trade_counts = results.get("jupiter_markets", {})
         # Use the 6h trader count we already fetched
         jupiter_accurate_traders = jupiter_24h_traders
 
         if jupiter_trade_counts:
-            jupiter_volume = next(
-                (m["volume_usd"] for m in all_metrics if m["protocol"] == "Jupiter Perps"), 0
-            )
-            jupiter_fee_rate = PROTOCOL_METADATA["Jupiter Perpetual Exchange"]["fee_rate"]
+            jupiter_metrics = metrics_by_protocol.get("Jupiter Perpetual Exchange")
+            jupiter_volume = jupiter_metrics["volume_usd"] if jupiter_metrics else 0
+            jupiter_fee_rate = jupiter_cfg["fee_rate"]
 
             # Distribute volume and calculate fees
             jupiter_volumes = distribute_volume_by_trades(jupiter_volume, jupiter_trade_counts)
@@ -1679,6 +2144,14 @@ def collect_all_data(hours: int = 24, fetch_markets: bool = True) -> tuple:
     return all_metrics, market_breakdowns
 
 
+# Row templates for print_dashboard (applied with str.format_map)
+ROW_FMT = ("{protocol:<15} {transactions:>12,} {traders:>10,} "
+           "${volume_usd:>16,.0f} ${fees_usd:>12,.0f} {share:>7.1f}%")
+API_MARKET_ROW_FMT = "{market:<20} ${volume:>17,.0f} {oi:>18,.2f} ${fees:>12,.0f} {share:>7.1f}%"
+DUNE_MARKET_ROW_FMT = ("{market:<15} {trades:>12,} {traders:>10,} "
+                       "${volume:>16,.0f} ${fees:>12,.0f} {share:>7.1f}%")
+
+
 def print_dashboard(all_metrics: list, market_breakdowns: dict, hours: int):
     """Print the formatted dashboard."""
     active_metrics = [m for m in all_metrics if m["volume_usd"] > 0 or m["transactions"] > 0]
@@ -1688,23 +2161,23 @@ def print_dashboard(all_metrics: list, market_breakdowns: dict, hours: int):
     total_traders = sum(m["traders"] for m in active_metrics)
 
     now = datetime.now().strftime("%Y-%m-%d %H:%M")
+    out = []
 
-    print("\n")
-    print("=" * 100)
-    print(f"SOLANA PERPS DASHBOARD ({hours}h)".center(60) + f"Updated: {now}".rjust(40))
-    print("=" * 100)
-    print(f"{'Protocol':<15} {'Txns':>12} {'Traders':>10} {'Volume (USD)':>18} {'Fees (USD)':>14} {'Share':>8}")
-    print("-" * 100)
+    out.append("\n")
+    out.append("=" * 100)
+    out.append(f"SOLANA PERPS DASHBOARD ({hours}h)".center(60) + f"Updated: {now}".rjust(40))
+    out.append("=" * 100)
+    out.append(f"{'Protocol':<15} {'Txns':>12} {'Traders':>10} {'Volume (USD)':>18} {'Fees (USD)':>14} {'Share':>8}")
+    out.append("-" * 100)
 
     for m in sorted(active_metrics, key=lambda x: x["volume_usd"], reverse=True):
         share = (m["volume_usd"] / total_volume * 100) if total_volume > 0 else 0
-        print(f"{m['protocol']:<15} {m['transactions']:>12,} {m['traders']:>10,} "
-              f"${m['volume_usd']:>16,.0f} ${m['fees_usd']:>12,.0f} {share:>7.1f}%")
+        out.append(ROW_FMT.format_map({**m, "share": share}))
 
-    print("-" * 100)
-    print(f"{'TOTAL':<15} {sum(m['transactions'] for m in active_metrics):>12,} "
-          f"{total_traders:>10,} ${total_volume:>16,.0f} ${total_fees:>12,.0f} {'100.0%':>8}")
-    print("=" * 100)
+    out.append("-" * 100)
+    out.append(f"{'TOTAL':<15} {sum(m['transactions'] for m in active_metrics):>12,} "
+               f"{total_traders:>10,} ${total_volume:>16,.0f} ${total_fees:>12,.0f} {'100.0%':>8}")
+    out.append("=" * 100)
 
     # Market breakdowns
     for protocol, data in market_breakdowns.items():
@@ -1721,60 +2194,64 @@ def print_dashboard(all_metrics: list, market_breakdowns: dict, hours: int):
         # Show accurate trader count in header
         trader_note = f" [{accurate_traders} unique traders in 6h sample]" if accurate_traders else ""
         source_note = " (from API)" if source == "api" else ""
-        print(f"\nMARKET BREAKDOWN - {protocol.upper()}{trader_note}{source_note}")
-        print("-" * 100)
+        out.append(f"\nMARKET BREAKDOWN - {protocol.upper()}{trader_note}{source_note}")
+        out.append("-" * 100)
 
         # Different display format for API vs Dune data
         if source == "api":
             # API provides actual volumes and open interest
-            print(f"{'Market':<20} {'Volume 24h':>18} {'Open Interest':>18} {'Fees':>14} {'Share':>8}")
-            print("-" * 100)
+            out.append(f"{'Market':<20} {'Volume 24h':>18} {'Open Interest':>18} {'Fees':>14} {'Share':>8}")
+            out.append("-" * 100)
 
             total_market_volume = sum(volumes.values())
             total_market_oi = sum(open_interest.values())
             total_market_fees = sum(fees.values())
-            sorted_markets = sorted(volumes.items(), key=lambda x: x[1], reverse=True)
+            inv_total_volume = 100.0 / total_market_volume if total_market_volume > 0 else 0.0
 
-            for market, vol in sorted_markets[:15]:
+            for market, vol in heapq.nlargest(15, volumes.items(), key=operator.itemgetter(1)):
                 oi = open_interest.get(market, 0)
                 fee = fees.get(market, 0)
-                share = (vol / total_market_volume * 100) if total_market_volume > 0 else 0
-                print(f"{market:<20} ${vol:>17,.0f} {oi:>18,.2f} ${fee:>12,.0f} {share:>7.1f}%")
+                share = vol * inv_total_volume
+                out.append(API_MARKET_ROW_FMT.format_map(
+                    {"market": market, "volume": vol, "oi": oi, "fees": fee, "share": share}))
 
-            print("-" * 100)
-            print(f"{'TOTAL':<20} ${total_market_volume:>17,.0f} {total_market_oi:>18,.2f} "
-                  f"${total_market_fees:>12,.0f} {'100.0%':>8}")
+            out.append("-" * 100)
+            out.append(f"{'TOTAL':<20} ${total_market_volume:>17,.0f} {total_market_oi:>18,.2f} "
+                       f"${total_market_fees:>12,.0f} {'100.0%':>8}")
         else:
             # Dune provides trades, we estimate volumes
             trades = data.get("trades", {})
-            print(f"{'Market':<15} {'Trades':>12} {'Traders':>10} {'Volume':>18} {'Fees':>14} {'Share':>8}")
-            print("-" * 100)
+            out.append(f"{'Market':<15} {'Trades':>12} {'Traders':>10} {'Volume':>18} {'Fees':>14} {'Share':>8}")
+            out.append("-" * 100)
 
             total_trades = sum(trades.values())
             total_market_traders = sum(traders.values())
             total_market_volume = sum(volumes.values())
             total_market_fees = sum(fees.values())
-            sorted_markets = sorted(trades.items(), key=lambda x: x[1], reverse=True)
+            inv_total_trades = 100.0 / total_trades if total_trades > 0 else 0.0
 
-            for market, trade_count in sorted_markets[:12]:
+            for market, trade_count in heapq.nlargest(12, trades.items(), key=operator.itemgetter(1)):
                 trader_count = traders.get(market, 0)
                 vol = volumes.get(market, 0)
                 fee = fees.get(market, 0)
-                share = (trade_count / total_trades * 100) if total_trades > 0 else 0
-                print(f"{market:<15} {trade_count:>12,} {trader_count:>10,} "
-                      f"${vol:>16,.0f} ${fee:>12,.0f} {share:>7.1f}%")
+                share = trade_count * inv_total_trades
+                out.append(DUNE_MARKET_ROW_FMT.format_map(
+                    {"market": market, "trades": trade_count, "traders": trader_count,
+                     "volume": vol, "fees": fee, "share": share}))
 
-            print("-" * 100)
-            print(f"{'TOTAL':<15} {total_trades:>12,} {total_market_traders:>10,} "
-                  f"${total_market_volume:>16,.0f} ${total_market_fees:>12,.0f} {'100.0%':>8}")
+            out.append("-" * 100)
+            out.append(f"{'TOTAL':<15} {total_trades:>12,} {total_market_traders:>10,} "
+                       f"${total_market_volume:>16,.0f} ${total_market_fees:>12,.0f} {'100.0%':>8}")
 
-        print("-" * 100)
+        out.append("-" * 100)
 
     # Data sources
-    print("\nData Sources:")
-    print("  Volume: DeFiLlama API (protocol) / Drift API (markets) | Tx Count: Solana RPC")
-    print("  Traders: Dune Analytics (6h sample, scaled) - Drift: instruction accounts, Jupiter: signers")
-    print("  Fees: Estimated (volume * fee_rate)")
+    out.append("\nData Sources:")
+    out.append("  Volume: DeFiLlama API (protocol) / Drift API (markets) | Tx Count: Solana RPC")
+    out.append("  Traders: Dune Analytics (6h sample, scaled) - Drift: instruction accounts, Jupiter: signers")
+    out.append("  Fees: Estimated (volume * fee_rate)")
+
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 def main():
@@ -6,15 +6,27 @@ Shows unique insights on Solana perp DEXes that aren't easily available elsewher
 Data refreshed every 15 minutes via GitHub Actions.
 """
 
+import heapq
 import json
 from datetime import datetime, timezone
+from types import MappingProxyType
 
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
 from pathlib import Path
 
+from cache_views import DERIVED_VIEW_KEYS, build_derived_views
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# File locations, resolved once relative to this script
+APP_DIR = Path(__file__).resolve().parent
+CACHE_PATH = APP_DIR / "data" / "cache.json"
+
 # Page config - dark theme friendly
 st.set_page_config(
     page_title="Solana Perps Insights",
@@ -27,41 +39,44 @@ st.set_page_config(
 # TERMINAL THEME CONFIGURATION
 # ══════════════════════════════════════════════════════════════════════════════
 
-# Theme options - can be changed via sidebar
-TERMINAL_THEMES = {
-    "matrix": {
+# Theme options - can be changed via sidebar (read-only, including each theme)
+TERMINAL_THEMES = MappingProxyType({
+    "matrix": MappingProxyType({
         "name": "Matrix Green",
         "accent": "#00FF41",
         "accent_dim": "#00aa2a",
         "positive": "#00FF41",
         "negative": "#FF0040",
         "warning": "#FFB000",
-    },
-    "amber": {
+    }),
+    "amber": MappingProxyType({
         "name": "Amber Retro",
         "accent": "#FFB000",
         "accent_dim": "#aa7500",
         "positive": "#00FF41",
         "negative": "#FF0040",
         "warning": "#FFB000",
-    },
-    "solana": {
+    }),
+    "solana": MappingProxyType({
         "name": "Solana Purple",
         "accent": "#9945FF",
         "accent_dim": "#6b30b3",
         "positive": "#00FFA3",
         "negative": "#FF4F6F",
         "warning": "#FFB800",
-    },
-    "cyan": {
+    }),
+    "cyan": MappingProxyType({
         "name": "Cyber Cyan",
         "accent": "#00FFA3",
         "accent_dim": "#00aa6d",
         "positive": "#00FFA3",
         "negative": "#FF4F6F",
         "warning": "#FFB800",
-    },
-}
+    }),
+})
+THEME_KEYS = tuple(TERMINAL_THEMES)
+THEME_INDEX = {key: i for i, key in enumerate(THEME_KEYS)}
+THEME_NAMES = {key: t["name"] for key, t in TERMINAL_THEMES.items()}
 
 # Get theme from URL query params or session state (settings persistence)
 query_params = st.query_params
@@ -79,75 +94,36 @@ theme = TERMINAL_THEMES[st.session_state.terminal_theme]
 crt_enabled = st.session_state.crt_effects
 
 # Terminal CSS Design System
-st.markdown(f"""
-<style>
-    /* ══════════════════════════════════════════════════════════════════════════
-       SOLANA PERPS TERMINAL - PURE TERMINAL AESTHETIC
-       Monospace everything, box-drawing borders, dense data display
-       ══════════════════════════════════════════════════════════════════════════ */
+TERMINAL_CSS_PATH = APP_DIR / "static" / "terminal.css"
+TERMINAL_CSS_URL = "./app/static/terminal.css"
 
-    /* Import monospace font */
-    @import url('https://fonts.googleapis.com/css2?family=JetBrains+Mono:wght@400;500;600;700&display=swap');
 
-    /* CSS Variables - Terminal Design Tokens */
-    :root {{
-        /* Background colors - pure black */
-        --bg-void: #000000;
-        --bg-deep: #0a0a0a;
-        --bg-surface: #111111;
-        --bg-elevated: #1a1a1a;
-        --bg-card: #0d0d0d;
+@st.cache_resource(show_spinner=False, max_entries=16)
+def build_css(theme_key: str, crt_enabled: bool, static_serving: bool) -> str:
+    """Page-wide terminal CSS, formatted once per theme/CRT combination.
 
+    The theme-independent rules live in static/terminal.css. With static
+    serving enabled the page links to it so browsers cache it, and only the
+    small theme/CRT block below is sent on each rerun; otherwise the file
+    is inlined. The result is an immutable str, so cache_resource can hand
+    the same object to every rerun and session.
+    """
+    theme = TERMINAL_THEMES[theme_key]
+    if static_serving:
+        base = f'<link rel="stylesheet" href="{TERMINAL_CSS_URL}">'
+    else:
+        base = f"<style>\n{TERMINAL_CSS_PATH.read_text()}</style>"
+    return base + f"""
+<style>
+    /* Per-session design tokens; static/terminal.css reads these via var() */
+    :root {{
         /* Theme accent colors */
         --accent: {theme['accent']};
         --accent-dim: {theme['accent_dim']};
         --positive: {theme['positive']};
         --negative: {theme['negative']};
         --warning: {theme['warning']};
-
-        /* Text colors */
-        --text-primary: #e0e0e0;
-        --text-secondary: #888888;
-        --text-muted: #555555;
-        --text-bright: #ffffff;
-
-        /* Borders */
-        --border-color: #333333;
-        --border-bright: #444444;
-
-        /* Typography - monospace only */
-        --font-mono: 'JetBrains Mono', 'Fira Code', 'Consolas', monospace;
-
-        /* No border radius - sharp corners */
-        --radius: 0px;
-    }}
-
-    /* ═══════════ GLOBAL STYLES ═══════════ */
-
-    .stApp {{
-        background: var(--bg-void) !important;
-        font-family: var(--font-mono) !important;
-    }}
-
-    /* CRT Scanline effect overlay - conditional */
-    .stApp::before {{
-        content: '';
-        position: fixed;
-        top: 0;
-        left: 0;
-        right: 0;
-        bottom: 0;
-        background: repeating-linear-gradient(
-            0deg,
-            rgba(0, 0, 0, 0.15),
-            rgba(0, 0, 0, 0.15) 1px,
-            transparent 1px,
-            transparent 2px
-        );
-        pointer-events: none;
-        z-index: 1000;
-        opacity: {0.3 if crt_enabled else 0};
-        transition: opacity 0.3s ease;
+        --crt-scanline-opacity: {0.3 if crt_enabled else 0};
     }}
 
     /* CRT text glow effect */
@@ -169,417 +145,98 @@ st.markdown(f"""
         animation: flicker 8s infinite;
     }
     '''}
+</style>
+"""
 
-    .main .block-container {{
-        padding-top: 1rem;
-        padding-bottom: 2rem;
-        max-width: 1600px;
-    }}
-
-    /* ═══════════ TYPOGRAPHY - ALL MONOSPACE ═══════════ */
-
-    * {{
-        font-family: var(--font-mono) !important;
-    }}
-
-    h1, h2, h3, .stMarkdown h1, .stMarkdown h2, .stMarkdown h3 {{
-        font-family: var(--font-mono) !important;
-        font-weight: 600 !important;
-        letter-spacing: 0.05em;
-        text-transform: uppercase;
-    }}
-
-    h1, .stMarkdown h1 {{
-        font-size: 1.2rem !important;
-        color: var(--accent) !important;
-        margin-bottom: 0.5rem !important;
-    }}
-
-    h2, .stMarkdown h2 {{
-        font-size: 0.9rem !important;
-        color: var(--accent) !important;
-        padding: 0.5rem 0;
-        border-bottom: 1px solid var(--border-color);
-        margin-top: 1rem !important;
-        margin-bottom: 0.75rem !important;
-    }}
-
-    h2::before {{
-        content: '► ';
-        color: var(--accent);
-    }}
-
-    h3, .stMarkdown h3 {{
-        font-size: 0.85rem !important;
-        color: var(--text-secondary) !important;
-        font-weight: 500 !important;
-    }}
-
-    h3::before {{
-        content: '> ';
-        color: var(--accent-dim);
-    }}
-
-    p, span, div, label {{
-        font-family: var(--font-mono) !important;
-        font-size: 0.8rem;
-    }}
-
-    /* Caption styling */
-    .stCaption, small, .caption {{
-        font-family: var(--font-mono) !important;
-        font-size: 0.7rem !important;
-        color: var(--text-muted) !important;
-    }}
-
-    /* ═══════════ SIDEBAR - TERMINAL STYLE ═══════════ */
-
-    section[data-testid="stSidebar"] {{
-        background: var(--bg-deep) !important;
-        border-right: 1px solid var(--border-color);
-    }}
-
-    section[data-testid="stSidebar"] > div {{
-        background: var(--bg-deep) !important;
-    }}
-
-    section[data-testid="stSidebar"] .stMarkdown h1 {{
-        font-size: 0.9rem !important;
-        color: var(--accent) !important;
-        letter-spacing: 0.1em;
-        text-transform: uppercase;
-        padding: 0.75rem 0;
-        border-bottom: 1px solid var(--border-color);
-        margin-bottom: 0.75rem !important;
-    }}
-
-    section[data-testid="stSidebar"] a {{
-        font-family: var(--font-mono) !important;
-        font-size: 0.75rem !important;
-        color: var(--text-secondary) !important;
-        text-decoration: none;
-        display: block;
-        padding: 6px 8px;
-        margin: 1px 0;
-        border-left: 2px solid transparent;
-        transition: all 0.1s ease;
-    }}
-
-    section[data-testid="stSidebar"] a:hover {{
-        color: var(--accent) !important;
-        background: rgba(255, 255, 255, 0.03);
-        border-left-color: var(--accent);
-    }}
-
-    section[data-testid="stSidebar"] hr {{
-        border-color: var(--border-color);
-        margin: 1rem 0;
-    }}
-
-    /* ═══════════ METRIC CARDS - TERMINAL PANELS ═══════════ */
-
-    div[data-testid="stMetric"] {{
-        background: var(--bg-card) !important;
-        border: 1px solid var(--border-color);
-        border-radius: var(--radius);
-        padding: 0.75rem 1rem;
-        position: relative;
-    }}
-
-    div[data-testid="stMetric"]::before {{
-        content: '┌─';
-        position: absolute;
-        top: -1px;
-        left: -1px;
-        color: var(--border-bright);
-        font-size: 0.7rem;
-    }}
-
-    div[data-testid="stMetric"]::after {{
-        content: '─┐';
-        position: absolute;
-        top: -1px;
-        right: -1px;
-        color: var(--border-bright);
-        font-size: 0.7rem;
-    }}
-
-    div[data-testid="stMetric"] label {{
-        font-family: var(--font-mono) !important;
-        font-size: 0.65rem !important;
-        color: var(--text-muted) !important;
-        text-transform: uppercase;
-        letter-spacing: 0.1em;
-        font-weight: 500 !important;
-    }}
-
-    div[data-testid="stMetric"] div[data-testid="stMetricValue"] {{
-        font-family: var(--font-mono) !important;
-        font-size: 1.3rem !important;
-        font-weight: 700 !important;
-        color: var(--accent) !important;
-        letter-spacing: 0.02em;
-    }}
-
-    div[data-testid="stMetric"] div[data-testid="stMetricDelta"] {{
-        font-family: var(--font-mono) !important;
-        font-size: 0.7rem !important;
-    }}
-
-    div[data-testid="stMetric"] div[data-testid="stMetricDelta"] svg {{
-        display: none;
-    }}
-
-    /* ═══════════ DATA TABLES - DENSE TERMINAL ═══════════ */
-
-    div[data-testid="stDataFrame"] {{
-        background: var(--bg-card);
-        border: 1px solid var(--border-color);
-        border-radius: var(--radius);
-        overflow: hidden;
-    }}
-
-    div[data-testid="stDataFrame"] table {{
-        font-family: var(--font-mono) !important;
-        font-size: 0.75rem !important;
-    }}
-
-    div[data-testid="stDataFrame"] th {{
-        background: var(--bg-elevated) !important;
-        color: var(--accent) !important;
-        font-weight: 600 !important;
-        text-transform: uppercase;
-        font-size: 0.65rem !important;
-        letter-spacing: 0.08em;
-        padding: 8px 12px !important;
-        border-bottom: 1px solid var(--border-color) !important;
-    }}
-
-    div[data-testid="stDataFrame"] td {{
-        color: var(--text-primary) !important;
-        padding: 6px 12px !important;
-        border-bottom: 1px solid var(--border-color) !important;
-    }}
-
-    div[data-testid="stDataFrame"] tr:hover td {{
-        background: rgba(255, 255, 255, 0.03) !important;
-        color: var(--text-bright) !important;
-    }}
-
-    /* ═══════════ BUTTONS & RADIO - TERMINAL STYLE ═══════════ */
-
-    div[data-testid="stRadio"] > div {{
-        background: var(--bg-card);
-        border: 1px solid var(--border-color);
-        border-radius: var(--radius);
-        padding: 0.25rem;
-        gap: 0;
-    }}
-
-    div[data-testid="stRadio"] label {{
-        font-family: var(--font-mono) !important;
-        font-size: 0.75rem !important;
-        padding: 0.4rem 0.8rem !important;
-        border-radius: var(--radius) !important;
-        color: var(--text-secondary) !important;
-        transition: all 0.1s ease !important;
-    }}
-
-    div[data-testid="stRadio"] label:hover {{
-        background: rgba(255, 255, 255, 0.05) !important;
-        color: var(--text-primary) !important;
-    }}
-
-    div[data-testid="stRadio"] label[data-checked="true"] {{
-        background: var(--bg-elevated) !important;
-        color: var(--accent) !important;
-        font-weight: 600 !important;
-        border: 1px solid var(--accent-dim);
-    }}
-
-    /* Hide radio circles */
-    div[data-testid="stRadio"] input[type="radio"] {{
-        display: none;
-    }}
-
-    /* ═══════════ SELECT BOX - TERMINAL STYLE ═══════════ */
-
-    div[data-testid="stSelectbox"] > div > div {{
-        background: var(--bg-card) !important;
-        border: 1px solid var(--border-color) !important;
-        border-radius: var(--radius) !important;
-    }}
-
-    div[data-testid="stSelectbox"] label {{
-        font-size: 0.7rem !important;
-        color: var(--text-muted) !important;
-        text-transform: uppercase;
-        letter-spacing: 0.08em;
-    }}
-
-    /* ═══════════ ALERTS & INFO BOXES ═══════════ */
-
-    div[data-testid="stAlert"] {{
-        background: var(--bg-card) !important;
-        border: 1px solid var(--border-color) !important;
-        border-radius: var(--radius) !important;
-        font-family: var(--font-mono) !important;
-        font-size: 0.75rem !important;
-    }}
-
-    .stAlert[data-baseweb*="info"] {{
-        border-left: 3px solid var(--accent) !important;
-    }}
-
-    .stAlert[data-baseweb*="warning"] {{
-        border-left: 3px solid var(--warning) !important;
-    }}
-
-    .stAlert[data-baseweb*="error"] {{
-        border-left: 3px solid var(--negative) !important;
-    }}
-
-    /* ═══════════ DIVIDERS - TERMINAL STYLE ═══════════ */
-
-    hr {{
-        border: none;
-        height: 1px;
-        background: var(--border-color);
-        margin: 1.5rem 0;
-    }}
-
-    /* ═══════════ SPINNERS ═══════════ */
-
-    .stSpinner > div {{
-        border-top-color: var(--accent) !important;
-    }}
-
-    /* ═══════════ TERMINAL CUSTOM CLASSES ═══════════ */
-
-    .terminal-box {{
-        background: var(--bg-card);
-        border: 1px solid var(--border-color);
-        padding: 1rem;
-        font-family: var(--font-mono);
-        font-size: 0.8rem;
-        color: var(--text-primary);
-        position: relative;
-    }}
-
-    .terminal-header {{
-        color: var(--accent);
-        font-size: 0.7rem;
-        text-transform: uppercase;
-        letter-spacing: 0.1em;
-        margin-bottom: 0.5rem;
-        padding-bottom: 0.5rem;
-        border-bottom: 1px solid var(--border-color);
-    }}
-
-    .terminal-value {{
-        font-size: 1.5rem;
-        font-weight: 700;
-        color: var(--accent);
-    }}
-
-    .terminal-label {{
-        font-size: 0.65rem;
-        color: var(--text-muted);
-        text-transform: uppercase;
-        letter-spacing: 0.1em;
-    }}
-
-    .positive {{ color: var(--positive) !important; }}
-    .negative {{ color: var(--negative) !important; }}
-    .muted {{ color: var(--text-muted) !important; }}
-    .accent {{ color: var(--accent) !important; }}
-
-    /* Blinking cursor effect */
-    @keyframes blink {{
-        0%, 50% {{ opacity: 1; }}
-        51%, 100% {{ opacity: 0; }}
-    }}
-
-    .cursor {{
-        display: inline-block;
-        width: 8px;
-        height: 14px;
-        background: var(--accent);
-        animation: blink 1s infinite;
-        vertical-align: middle;
-        margin-left: 2px;
-    }}
-
-    /* Status indicator */
-    .status-dot {{
-        display: inline-block;
-        width: 6px;
-        height: 6px;
-        border-radius: 50%;
-        margin-right: 6px;
-    }}
-
-    .status-dot.live {{ background: var(--positive); }}
-    .status-dot.stale {{ background: var(--warning); }}
-    .status-dot.error {{ background: var(--negative); }}
-
-    /* Terminal-style loading animation */
-    @keyframes terminal-loading {{
-        0% {{ content: '[    ]'; }}
-        20% {{ content: '[=   ]'; }}
-        40% {{ content: '[==  ]'; }}
-        60% {{ content: '[=== ]'; }}
-        80% {{ content: '[====]'; }}
-        100% {{ content: '[    ]'; }}
-    }}
-
-    @keyframes pulse {{
-        0%, 100% {{ opacity: 0.4; }}
-        50% {{ opacity: 1; }}
-    }}
 
-    .terminal-loading {{
-        display: inline-flex;
-        align-items: center;
-        gap: 8px;
-        color: var(--accent);
-        font-size: 0.75rem;
-    }}
+@st.cache_resource(show_spinner=False, max_entries=8)
+def build_nav_html(theme_key: str) -> str:
+    """Sidebar nav links and their styles, formatted once per theme."""
+    theme = TERMINAL_THEMES[theme_key]
+    return f"""
+<style>
+.nav-link {{
+    font-size: 0.75rem;
+    color: #888;
+    text-decoration: none;
+    display: block;
+    padding: 6px 8px;
+    margin: 1px 0;
+    border-left: 2px solid transparent;
+    transition: all 0.1s ease;
+}}
+.nav-link:hover {{
+    color: {theme['accent']};
+    background: rgba(255, 255, 255, 0.03);
+    border-left-color: {theme['accent']};
+}}
+.nav-link::before {{
+    content: '> ';
+    color: #444;
+}}
+.nav-link:hover::before {{
+    color: {theme['accent']};
+}}
+</style>
 
-    .terminal-loading::before {{
-        content: '▶';
-        animation: pulse 1s infinite;
-    }}
+<a href="#solana-perps-overview" class="nav-link">OVERVIEW</a>
+<a href="#cross-chain-comparison" class="nav-link">CROSS_CHAIN</a>
+<a href="#solana-protocol-breakdown" class="nav-link">PROTOCOLS</a>
+<a href="#best-venue-by-asset" class="nav-link">BEST_VENUE</a>
+<a href="#funding-rate-overview" class="nav-link">FUNDING</a>
+<a href="#market-deep-dive" class="nav-link">MARKETS</a>
+<a href="#cross-platform-traders" class="nav-link">WALLETS</a>
+<a href="#whale-activity" class="nav-link">WHALES</a>
+<a href="#liquidations-rpc" class="nav-link">LIQUIDATIONS</a>
+<a href="#quick-insights" class="nav-link">INSIGHTS</a>
+    """
 
-    /* Streamlit spinner override - terminal style */
-    .stSpinner > div {{
-        border-color: var(--accent) !important;
-    }}
 
-    .stSpinner > div > div {{
-        background-color: transparent !important;
-    }}
+@st.cache_resource(show_spinner=False, max_entries=8)
+def build_header_html(theme_key: str) -> str:
+    """Page header banner, formatted once per theme."""
+    theme = TERMINAL_THEMES[theme_key]
+    return f"""
+<div style="background: #0a0a0a; border: 1px solid {theme['accent']}40; padding: 1.5rem; margin-bottom: 1rem;">
+    <div style="text-align: center;">
+        <div style="color: {theme['accent']}; font-size: 2rem; font-weight: 700; letter-spacing: 0.1em; margin-bottom: 0.25rem;">
+            SOLANA PERPS
+        </div>
+        <div style="color: #555; font-size: 0.7rem; letter-spacing: 0.2em; margin-bottom: 1rem;">
+            ════════════════════════════════════════
+        </div>
+        <div style="color: {theme['accent']}; font-size: 0.75rem; letter-spacing: 0.15em;">
+            PERPETUALS ANALYTICS TERMINAL
+        </div>
+        <div style="color: #444; font-size: 0.65rem; margin-top: 0.5rem;">
+            v1.0.0
+        </div>
+    </div>
+</div>
+"""
 
-    div[data-testid="stSpinner"] {{
-        color: var(--accent) !important;
-    }}
 
-    div[data-testid="stSpinner"]::before {{
-        content: '> LOADING...';
-        color: var(--accent);
-        font-size: 0.75rem;
-        letter-spacing: 0.1em;
-    }}
+st.markdown(
+    build_css(st.session_state.terminal_theme, crt_enabled, st.get_option("server.enableStaticServing")),
+    unsafe_allow_html=True,
+)
 
-    /* Hide default streamlit elements */
-    #MainMenu {{ visibility: hidden; }}
-    footer {{ visibility: hidden; }}
-    header {{ visibility: hidden; }}
+def _on_settings_change():
+    """Copy all sidebar settings into session state and the URL in one update."""
+    st.session_state.terminal_theme = st.session_state.theme_select
+    st.session_state.crt_effects = st.session_state.crt_toggle
+    st.session_state.show_alerts = st.session_state.alerts_toggle
+    st.query_params.update({
+        "theme": st.session_state.terminal_theme,
+        "crt": "1" if st.session_state.crt_effects else "0",
+        "alerts": "1" if st.session_state.show_alerts else "0",
+    })
 
-</style>
-""", unsafe_allow_html=True)
 
 # Sidebar navigation - Terminal Style
+# Settings widgets update session state in on_change callbacks, which run
+# before the script, so a toggle costs one rerun instead of two (the widget
+# rerun plus an explicit st.rerun() to re-apply the CSS built above)
 with st.sidebar:
     # Terminal-style header
     st.markdown(f"""
@@ -595,20 +252,16 @@ with st.sidebar:
     <div style="font-size: 0.65rem; text-transform: uppercase; letter-spacing: 0.1em; color: #555; margin: 1rem 0 0.5rem 0;">[ THEME ]</div>
     """, unsafe_allow_html=True)
 
-    theme_names = {k: v["name"] for k, v in TERMINAL_THEMES.items()}
-    selected_theme = st.selectbox(
+    st.selectbox(
         "Theme",
-        options=list(theme_names.keys()),
-        format_func=lambda x: theme_names[x],
-        index=list(theme_names.keys()).index(st.session_state.terminal_theme),
-        label_visibility="collapsed"
+        options=THEME_KEYS,
+        format_func=THEME_NAMES.__getitem__,
+        index=THEME_INDEX[st.session_state.terminal_theme],
+        label_visibility="collapsed",
+        key="theme_select",
+        on_change=_on_settings_change,
     )
 
-    if selected_theme != st.session_state.terminal_theme:
-        st.session_state.terminal_theme = selected_theme
-        st.query_params["theme"] = selected_theme
-        st.rerun()
-
     # Display settings
     st.markdown("""
     <div style="font-size: 0.65rem; text-transform: uppercase; letter-spacing: 0.1em; color: #555; margin: 1rem 0 0.5rem 0;">[ DISPLAY ]</div>
@@ -616,59 +269,21 @@ with st.sidebar:
 
     col1, col2 = st.columns(2)
     with col1:
-        crt_toggle = st.checkbox("CRT", value=st.session_state.crt_effects, help="Scanlines & glow")
-        if crt_toggle != st.session_state.crt_effects:
-            st.session_state.crt_effects = crt_toggle
-            st.query_params["crt"] = "1" if crt_toggle else "0"
-            st.rerun()
+        st.checkbox(
+            "CRT", value=st.session_state.crt_effects, help="Scanlines & glow",
+            key="crt_toggle", on_change=_on_settings_change,
+        )
     with col2:
-        alerts_toggle = st.checkbox("Alerts", value=st.session_state.show_alerts, help="Show alerts panel")
-        if alerts_toggle != st.session_state.show_alerts:
-            st.session_state.show_alerts = alerts_toggle
-            st.query_params["alerts"] = "1" if alerts_toggle else "0"
-            st.rerun()
+        st.checkbox(
+            "Alerts", value=st.session_state.show_alerts, help="Show alerts panel",
+            key="alerts_toggle", on_change=_on_settings_change,
+        )
 
     st.markdown("""
     <div style="font-size: 0.65rem; text-transform: uppercase; letter-spacing: 0.1em; color: #555; margin: 1rem 0 0.5rem 0;">[ NAVIGATE ]</div>
     """, unsafe_allow_html=True)
 
-    st.markdown(f"""
-<style>
-.nav-link {{
-    font-size: 0.75rem;
-    color: #888;
-    text-decoration: none;
-    display: block;
-    padding: 6px 8px;
-    margin: 1px 0;
-    border-left: 2px solid transparent;
-    transition: all 0.1s ease;
-}}
-.nav-link:hover {{
-    color: {theme['accent']};
-    background: rgba(255, 255, 255, 0.03);
-    border-left-color: {theme['accent']};
-}}
-.nav-link::before {{
-    content: '> ';
-    color: #444;
-}}
-.nav-link:hover::before {{
-    color: {theme['accent']};
-}}
-</style>
-
-<a href="#solana-perps-overview" class="nav-link">OVERVIEW</a>
-<a href="#cross-chain-comparison" class="nav-link">CROSS_CHAIN</a>
-<a href="#solana-protocol-breakdown" class="nav-link">PROTOCOLS</a>
-<a href="#best-venue-by-asset" class="nav-link">BEST_VENUE</a>
-<a href="#funding-rate-overview" class="nav-link">FUNDING</a>
-<a href="#market-deep-dive" class="nav-link">MARKETS</a>
-<a href="#cross-platform-traders" class="nav-link">WALLETS</a>
-<a href="#whale-activity" class="nav-link">WHALES</a>
-<a href="#liquidations-rpc" class="nav-link">LIQUIDATIONS</a>
-<a href="#quick-insights" class="nav-link">INSIGHTS</a>
-    """, unsafe_allow_html=True)
+    st.markdown(build_nav_html(st.session_state.terminal_theme), unsafe_allow_html=True)
 
     st.divider()
 
@@ -724,23 +339,23 @@ def get_plotly_theme():
 
 PLOTLY_THEME = get_plotly_theme()
 
-# Protocol-specific colors - terminal style
-PROTOCOL_COLORS = {
+# Protocol-specific colors - terminal style (read-only)
+PROTOCOL_COLORS = MappingProxyType({
     "Drift": "#4F9DFF",
     "Jupiter": "#00FFA3",
     "Pacifica": "#DC1FFF",
     "Adrena": "#FFB800",
     "FlashTrade": "#FF6B6B",
     "default": theme["accent"],
-}
+})
 
 # Sequential color palette for charts
-CHART_COLORS = [theme["accent"], "#4F9DFF", "#00FFA3", "#DC1FFF", "#FFB800", "#FF6B6B", "#6366F1", "#14B8A6"]
+CHART_COLORS = (theme["accent"], "#4F9DFF", "#00FFA3", "#DC1FFF", "#FFB800", "#FF6B6B", "#6366F1", "#14B8A6")
 
 
 def apply_plotly_theme(fig):
     """Apply the Terminal theme to a Plotly figure."""
-    plotly_theme = get_plotly_theme()
+    plotly_theme = PLOTLY_THEME  # Built once per rerun for the session's theme
     fig.update_layout(
         font_family=plotly_theme["font_family"],
         font_color=plotly_theme["text_color"],
@@ -782,6 +397,12 @@ def apply_plotly_theme(fig):
 
 def terminal_section_header(title: str) -> str:
     """Generate a terminal-style section header."""
+    return _section_header_html(title, st.session_state.terminal_theme)
+
+
+@st.cache_resource(show_spinner=False, max_entries=128)
+def _section_header_html(title: str, theme_key: str) -> str:
+    theme = TERMINAL_THEMES[theme_key]
     title_upper = title.upper().replace(" ", "_")
     padding = 80 - len(title_upper) - 6  # Account for brackets and dashes
     return f"""
@@ -793,12 +414,13 @@ def terminal_section_header(title: str) -> str:
 """
 
 
-def ascii_bar(value: float, max_value: float, width: int = 20) -> str:
-    """Generate an ASCII progress bar."""
-    if max_value == 0:
-        return "░" * width
-    filled = int((value / max_value) * width)
-    return "█" * filled + "░" * (width - filled)
+@st.cache_resource(show_spinner=False, max_entries=64)
+def _ascii_bar_segments(width: int, color: str) -> tuple:
+    """Formatted bar HTML for every fill level 0..width of one width/color."""
+    return tuple(
+        f'<span style="color: {color};">{"█" * filled}</span><span style="color: #333;">{"░" * (width - filled)}</span>'
+        for filled in range(width + 1)
+    )
 
 
 def ascii_bar_html(value: float, max_value: float, width: int = 15, color: str = None, total: float = None) -> str:
@@ -815,83 +437,116 @@ def ascii_bar_html(value: float, max_value: float, width: int = 15, color: str =
         color = theme["accent"]
     if max_value == 0:
         return f'<span style="color: #333;">{"░" * width}</span>'
-    filled = int((value / max_value) * width)
+    filled = min(max(int((value / max_value) * width), 0), width)
     # Use total for percentage if provided, otherwise use max_value
     pct_base = total if total is not None else max_value
     pct = (value / pct_base) * 100 if pct_base > 0 else 0
-    bar = f'<span style="color: {color};">{"█" * filled}</span><span style="color: #333;">{"░" * (width - filled)}</span>'
+    bar = _ascii_bar_segments(width, color)[filled]
     return f'{bar} <span style="color: #888;">{pct:.1f}%</span>'
 
 
-def ascii_sparkline(values: list, width: int = 10) -> str:
-    """Generate an ASCII sparkline from values."""
-    if not values:
-        return "─" * width
-    chars = "▁▂▃▄▅▆▇█"
-    min_val = min(values)
-    max_val = max(values)
-    if max_val == min_val:
-        return chars[4] * len(values)
-    return "".join(chars[int((v - min_val) / (max_val - min_val) * 7)] for v in values[-width:])
-
-
 def render_terminal_table(headers: list, rows: list, col_styles: dict = None) -> str:
-    """Render a terminal-style HTML table with box drawing characters."""
+    """Render a terminal-style HTML table with box drawing characters.
+
+    Base cell/header styling comes from the .term-tbl rules in
+    static/terminal.css; only columns listed in col_styles get inline styles.
+    """
     if col_styles is None:
         col_styles = {}
 
     # Build header row
-    header_cells = "".join(f'<th style="padding: 8px 12px; text-align: left; color: {theme["accent"]}; font-size: 0.7rem; letter-spacing: 0.05em; border-bottom: 1px solid #333;">{h}</th>' for h in headers)
-
-    # Build data rows
-    data_rows = ""
+    header_cells = "".join(f"<th>{h}</th>" for h in headers)
+
+    # Per-column cell prefixes are built once, not per row; rows are joined once
+    ncols = max((len(row) for row in rows), default=0)
+    cell_opens = [
+        f'<td style="{col_styles[i]}">' if i in col_styles else "<td>"
+        for i in range(ncols)
+    ]
+    parts = []
     for row in rows:
-        cells = ""
-        for i, cell in enumerate(row):
-            style = col_styles.get(i, "color: #888;")
-            cells += f'<td style="padding: 6px 12px; font-size: 0.75rem; border-bottom: 1px solid #222; {style}">{cell}</td>'
-        data_rows += f'<tr style="transition: background 0.1s;">{cells}</tr>'
+        parts.append("<tr>")
+        for cell_open, cell in zip(cell_opens, row):
+            parts.extend((cell_open, str(cell), "</td>"))
+        parts.append("</tr>")
+    data_rows = "".join(parts)
 
     return f'''
-    <div style="background: #0a0a0a; border: 1px solid #333; overflow: hidden; margin: 0.5rem 0;">
-        <table style="width: 100%; border-collapse: collapse; font-family: 'JetBrains Mono', monospace;">
-            <thead><tr style="background: #111;">{header_cells}</tr></thead>
+    <div class="term-tbl-wrap">
+        <table class="term-tbl">
+            <thead><tr>{header_cells}</tr></thead>
             <tbody>{data_rows}</tbody>
         </table>
     </div>
     '''
 
 
-def collapsible_section(title: str, content_key: str, default_open: bool = True) -> bool:
-    """Create a collapsible section header. Returns True if section is open."""
-    if f"collapse_{content_key}" not in st.session_state:
-        st.session_state[f"collapse_{content_key}"] = default_open
+@st.cache_data(show_spinner=False, max_entries=1)
+def load_cache(mtime: float):
+    """Load cached data from JSON file.
 
-    is_open = st.session_state[f"collapse_{content_key}"]
-    indicator = "▼" if is_open else "►"
+    `mtime` is only used as the cache key, so the file is re-parsed only
+    after GitHub Actions rewrites it.
+    """
+    if orjson is not None:
+        return orjson.loads(CACHE_PATH.read_bytes())
+    with open(CACHE_PATH) as f:
+        return json.load(f)
 
-    col1, col2 = st.columns([20, 1])
-    with col1:
-        st.markdown(f"""
-        <div style="color: {theme['accent']}; font-size: 0.75rem; font-weight: 600; letter-spacing: 0.05em; cursor: pointer;">
-            {indicator} {title.upper().replace(" ", "_")}
-        </div>
-        """, unsafe_allow_html=True)
-    with col2:
-        if st.button("toggle", key=f"btn_{content_key}", label_visibility="collapsed"):
-            st.session_state[f"collapse_{content_key}"] = not is_open
-            st.rerun()
 
-    return is_open
+@st.cache_resource(show_spinner=False, max_entries=32)
+def cached_figure(name: str, mtime: float, theme_name: str, _build) -> go.Figure:
+    """Build a Plotly figure once per cache file and theme.
 
+    Figures only depend on cache.json and the selected theme, so one shared
+    (read-only) instance serves every rerun and session until the file changes.
+    """
+    return _build()
+
+
+@st.cache_resource(show_spinner=False, max_entries=64)
+def cached_html(name: str, mtime: float, theme_name: str, _build) -> str:
+    """Build an HTML table once per cache file and theme, like cached_figure."""
+    return _build()
+
+
+@st.cache_data(show_spinner=False, max_entries=1)
+def load_derived_views(mtime: float) -> dict:
+    """Build derived views once per cache file for caches that predate cache["derived"]."""
+    return build_derived_views(load_cache(mtime))
+
+
+# Columns of the cache["protocols"] rows written by update_cache.py
+PROTOCOL_COLUMNS = ["protocol", "volume_24h", "volume_7d", "change_1d", "change_7d", "transactions", "traders", "fees"]
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def base_protocol_df(mtime: float) -> pd.DataFrame:
+    """Active protocols sorted by 24h volume, built once per cache file.
+
+    Shared by every session, so callers must take a .copy() before mutating.
+    """
+    df = pd.DataFrame.from_records(load_cache(mtime)["protocols"], columns=PROTOCOL_COLUMNS)
+    return df[df["volume_24h"] > 0].sort_values("volume_24h", ascending=False)
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def protocol_totals(mtime: float) -> dict:
+    """Column totals of base_protocol_df, computed once per cache file.
+
+    Summed per column so integer columns (traders, transactions) stay integers.
+    """
+    df = base_protocol_df(mtime)
+    return {col: df[col].sum() for col in ("volume_24h", "traders", "fees", "transactions")}
 
-def load_cache():
-    """Load cached data from JSON file."""
-    cache_path = Path(__file__).parent / "data" / "cache.json"
-    if not cache_path.exists():
-        return None
-    with open(cache_path) as f:
-        return json.load(f)
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def base_drift_df(mtime: float) -> pd.DataFrame:
+    """Drift markets as a frame indexed by market, built once per cache file.
+
+    Shared by every session, so callers must not mutate it.
+    """
+    return pd.DataFrame.from_dict(load_cache(mtime).get("drift_markets", {}), orient="index").fillna(0)
 
 
 def format_change(value):
@@ -920,6 +575,15 @@ def format_volume(value):
     return f"${value:,.0f}"
 
 
+def funding_colors(rates: pd.Series) -> pd.Series:
+    """Color per funding rate: positive (shorts pay), negative (longs pay), grey if flat."""
+    return (
+        pd.Series("#888", index=rates.index)
+        .mask(rates > 0, theme["negative"])
+        .mask(rates < 0, theme["positive"])
+    )
+
+
 def get_time_window_data(cache: dict, window: str) -> dict:
     """Get data for selected time window with fallback to legacy format."""
     time_windows = cache.get("time_windows", {})
@@ -945,7 +609,12 @@ def get_time_window_data(cache: dict, window: str) -> dict:
 
 
 # Load cached data with terminal-style loading state
-cache = load_cache()
+# One stat() per rerun: it both checks the file exists and gives the cache key
+try:
+    cache_mtime = CACHE_PATH.stat().st_mtime
+except FileNotFoundError:
+    cache_mtime = None
+cache = load_cache(cache_mtime) if cache_mtime is not None else None
 
 if cache is None:
     st.markdown(f"""
@@ -968,25 +637,17 @@ if cache is None:
     """, unsafe_allow_html=True)
     st.stop()
 
+# Display-ready views precomputed by update_cache.py (computed once per file for older caches)
+derived = cache.get("derived") or {}
+if not all(key in derived for key in DERIVED_VIEW_KEYS):
+    derived = load_derived_views(cache_mtime)
+
+drift_markets = cache.get("drift_markets", {})
+jupiter_markets = cache.get("jupiter_markets", {})
+global_derivatives = cache.get("global_derivatives", [])
+
 # Header - Terminal Style (clean, no ASCII art)
-st.markdown(f"""
-<div style="background: #0a0a0a; border: 1px solid {theme['accent']}40; padding: 1.5rem; margin-bottom: 1rem;">
-    <div style="text-align: center;">
-        <div style="color: {theme['accent']}; font-size: 2rem; font-weight: 700; letter-spacing: 0.1em; margin-bottom: 0.25rem;">
-            SOLANA PERPS
-        </div>
-        <div style="color: #555; font-size: 0.7rem; letter-spacing: 0.2em; margin-bottom: 1rem;">
-            ════════════════════════════════════════
-        </div>
-        <div style="color: {theme['accent']}; font-size: 0.75rem; letter-spacing: 0.15em;">
-            PERPETUALS ANALYTICS TERMINAL
-        </div>
-        <div style="color: #444; font-size: 0.65rem; margin-top: 0.5rem;">
-            v1.0.0
-        </div>
-    </div>
-</div>
-""", unsafe_allow_html=True)
+st.markdown(build_header_html(st.session_state.terminal_theme), unsafe_allow_html=True)
 
 updated_at = cache.get("updated_at", "Unknown")
 
@@ -1030,55 +691,26 @@ if is_stale:
 
 # Alerts Panel - Show unusual market conditions
 if st.session_state.show_alerts:
-    drift_markets_alert = cache.get("drift_markets", {})
-    alerts = []
-
-    # Check for extreme funding rates (>0.1% or <-0.1%)
-    for market, info in drift_markets_alert.items():
-        funding = info.get("funding_rate", 0)
-        vol = info.get("volume", 0)
-        if vol > 100000:  # Only check markets with decent volume
-            if funding > 0.001:  # >0.1%
-                alerts.append({
-                    "type": "funding_high",
-                    "icon": "⚠",
-                    "msg": f"{market.replace('-PERP', '')} funding HIGH: {funding*100:+.3f}% (longs pay)",
-                    "color": theme["negative"]
-                })
-            elif funding < -0.001:  # <-0.1%
-                alerts.append({
-                    "type": "funding_low",
-                    "icon": "💰",
-                    "msg": f"{market.replace('-PERP', '')} funding LOW: {funding*100:+.3f}% (shorts pay)",
-                    "color": theme["positive"]
-                })
-
-    # Check for big volume changes
-    for _, row in pd.DataFrame(cache.get("protocols", [])).iterrows():
-        change = row.get("change_1d", 0)
-        if change > 50:
-            alerts.append({
-                "type": "volume_spike",
-                "icon": "📈",
-                "msg": f"{row['protocol']} volume +{change:.0f}% in 24h",
-                "color": theme["positive"]
-            })
-        elif change < -30:
-            alerts.append({
-                "type": "volume_drop",
-                "icon": "📉",
-                "msg": f"{row['protocol']} volume {change:.0f}% in 24h",
-                "color": theme["warning"]
-            })
-
+    # Alerts are precomputed per cache file in cache_views.build_alerts
+    alerts = derived["alerts"]
     if alerts:
-        alerts_html = "".join([
-            f'<div style="display: flex; align-items: center; gap: 8px; padding: 4px 0;">'
-            f'<span>{a["icon"]}</span>'
-            f'<span style="color: {a["color"]};">{a["msg"]}</span>'
-            f'</div>'
-            for a in alerts[:5]  # Limit to 5 alerts
-        ])
+        alert_styles = {
+            "funding_high": ("⚠", theme["negative"], "{name} funding HIGH: {pct:+.3f}% (longs pay)"),
+            "funding_low": ("💰", theme["positive"], "{name} funding LOW: {pct:+.3f}% (shorts pay)"),
+            "volume_spike": ("📈", theme["positive"], "{name} volume +{value:.0f}% in 24h"),
+            "volume_drop": ("📉", theme["warning"], "{name} volume {value:.0f}% in 24h"),
+        }
+        alert_rows = []
+        for a in alerts[:5]:  # Limit to 5 alerts
+            icon, color, msg = alert_styles[a["type"]]
+            msg = msg.format(name=a["name"], value=a["value"], pct=a["value"] * 100)
+            alert_rows.append(
+                f'<div style="display: flex; align-items: center; gap: 8px; padding: 4px 0;">'
+                f'<span>{icon}</span>'
+                f'<span style="color: {color};">{msg}</span>'
+                f'</div>'
+            )
+        alerts_html = "".join(alert_rows)
 
         st.markdown(f"""
         <div style="background: #0a0a0a; border: 1px solid {theme['warning']}40; padding: 0.75rem; margin-bottom: 1rem; font-size: 0.7rem;">
@@ -1089,39 +721,24 @@ if st.session_state.show_alerts:
         </div>
         """, unsafe_allow_html=True)
 
-# Time window selector - terminal style
-st.markdown(f"""
-<div style="font-size: 0.65rem; text-transform: uppercase; letter-spacing: 0.1em; color: #555; margin-bottom: 0.5rem;">[ TIME_WINDOW ]</div>
-""", unsafe_allow_html=True)
-
-time_window = st.radio(
-    "Time Window",
-    options=["1h", "4h", "8h", "24h"],
-    index=0,
-    horizontal=True,
-    help="Select time window for trader counts, liquidations, and wallet overlap data",
-    label_visibility="collapsed"
-)
-
 # Calculate totals
-protocol_df = pd.DataFrame(cache["protocols"])
-protocol_df = protocol_df[protocol_df["volume_24h"] > 0].sort_values("volume_24h", ascending=False)
+protocol_df = base_protocol_df(cache_mtime).copy()
 
-total_volume = protocol_df["volume_24h"].sum()
-total_traders = protocol_df["traders"].sum()
-total_fees = protocol_df["fees"].sum()
-total_txns = protocol_df["transactions"].sum()
+totals = protocol_totals(cache_mtime)
+total_volume = totals["volume_24h"]
+total_traders = totals["traders"]
+total_fees = totals["fees"]
+total_txns = totals["transactions"]
 total_oi = cache.get("total_open_interest", 0)
 
 # Get top protocol and SOL price for sidebar
 top_protocol = protocol_df.iloc[0] if len(protocol_df) > 0 else None
-drift_markets = cache.get("drift_markets", {})
 sol_price = drift_markets.get("SOL-PERP", {}).get("last_price", 0)
 sol_funding = drift_markets.get("SOL-PERP", {}).get("funding_rate", 0)
 
 # Add mini stats to sidebar
-with st.sidebar:
-    st.markdown(f"""
+def build_quick_stats():
+    return f"""
     <div style="font-size: 0.65rem; text-transform: uppercase; letter-spacing: 0.1em; color: #555; margin: 1rem 0 0.5rem 0;">[ QUICK_STATS ]</div>
     <div style="background: #0a0a0a; border: 1px solid #333; padding: 0.5rem; font-size: 0.7rem;">
         <div style="display: flex; justify-content: space-between; margin-bottom: 6px;">
@@ -1145,16 +762,26 @@ with st.sidebar:
             <span style="color: #e0e0e0;">{total_traders:,}</span>
         </div>
     </div>
-    """, unsafe_allow_html=True)
+    """
+
+
+with st.sidebar:
+    st.markdown(
+        cached_html("quick_stats", cache_mtime, st.session_state.terminal_theme, build_quick_stats),
+        unsafe_allow_html=True,
+    )
 
     # Top movers
     if len(protocol_df) > 0:
-        top_gainer = protocol_df.loc[protocol_df["change_1d"].idxmax()]
+        # Positional argmax reads the two cells directly instead of building a row Series
+        top_idx = protocol_df["change_1d"].argmax()
+        top_gainer_protocol = protocol_df["protocol"].iat[top_idx]
+        top_gainer_change = protocol_df["change_1d"].iat[top_idx]
         st.markdown(f"""
         <div style="font-size: 0.65rem; text-transform: uppercase; letter-spacing: 0.1em; color: #555; margin: 1rem 0 0.5rem 0;">[ TOP_MOVER_24H ]</div>
         <div style="background: #0a0a0a; border: 1px solid #333; padding: 0.5rem; font-size: 0.7rem;">
-            <div style="color: {PROTOCOL_COLORS.get(top_gainer['protocol'], theme['accent'])}; font-weight: 600;">{top_gainer['protocol']}</div>
-            <div style="color: {theme['positive']}; font-size: 0.85rem;">▲ {top_gainer['change_1d']:.1f}%</div>
+            <div style="color: {PROTOCOL_COLORS.get(top_gainer_protocol, theme['accent'])}; font-weight: 600;">{top_gainer_protocol}</div>
+            <div style="color: {theme['positive']}; font-size: 0.85rem;">▲ {top_gainer_change:.1f}%</div>
         </div>
         """, unsafe_allow_html=True)
 
@@ -1192,23 +819,16 @@ st.divider()
 st.markdown(terminal_section_header("Cross-Chain Comparison"), unsafe_allow_html=True)
 st.caption("> Comparing Solana perps to other chains")
 
-global_derivatives = cache.get("global_derivatives", [])
-
 if global_derivatives:
     # Calculate global total
     global_total = sum(p["volume_24h"] for p in global_derivatives)
     solana_total = total_volume
 
-    # Find Solana protocol rankings
-    solana_protocols = []
-    for i, p in enumerate(global_derivatives):
-        if "Solana" in p.get("chains", []):
-            solana_protocols.append({
-                "name": p["name"],
-                "rank": i + 1,
-                "volume": p["volume_24h"],
-                "share": p["volume_24h"] / global_total * 100 if global_total > 0 else 0,
-            })
+    # Solana protocol rankings (precomputed)
+    solana_protocols = derived["solana_rankings"]
+
+    # Solana rows are highlighted in both the table and the bar chart
+    solana_names = {sp["name"] for sp in solana_protocols}
 
     # Show Solana ranking summary at top
     if solana_protocols:
@@ -1233,44 +853,50 @@ if global_derivatives:
     with col1:
         # Create terminal-style comparison table
         max_global_vol = global_derivatives[0]["volume_24h"] if global_derivatives else 1
-        comparison_rows = []
-        for i, p in enumerate(global_derivatives[:12]):
-            is_solana = "Solana" in p.get("chains", [])
-            chain = p.get("chains", ["?"])[0][:3].upper()
-            vol = p["volume_24h"]
-            change_1d = p.get("change_1d", 0)
-            share = vol / global_total * 100 if global_total > 0 else 0
-
-            # Highlight Solana protocols
-            name_color = theme["accent"] if is_solana else "#888"
-            change_color = theme["positive"] if change_1d > 0 else theme["negative"] if change_1d < 0 else "#555"
-
-            comparison_rows.append([
-                f'<span style="color: #555;">#{i+1:02d}</span>',
-                f'<span style="color: {name_color}; font-weight: {"600" if is_solana else "400"};">{p["name"][:12]}</span>',
-                f'<span style="color: #555;">{chain}</span>',
-                f'<span style="color: #e0e0e0;">{format_volume(vol)}</span>',
-                ascii_bar_html(vol, max_global_vol, width=8, color=theme["accent"] if is_solana else "#555", total=global_total),
-                f'<span style="color: {change_color};">{"▲" if change_1d > 0 else "▼" if change_1d < 0 else "─"}{abs(change_1d):.1f}%</span>',
-            ])
+        def build_cross_chain_table():
+            comparison_rows = []
+            for i, p in enumerate(global_derivatives[:12]):
+                is_solana = p["name"] in solana_names
+                chain = p.get("chains", ["?"])[0][:3].upper()
+                vol = p["volume_24h"]
+                change_1d = p.get("change_1d", 0)
+
+                # Highlight Solana protocols
+                name_color = theme["accent"] if is_solana else "#888"
+                change_color = theme["positive"] if change_1d > 0 else theme["negative"] if change_1d < 0 else "#555"
+
+                comparison_rows.append([
+                    f'<span style="color: #555;">#{i+1:02d}</span>',
+                    f'<span style="color: {name_color}; font-weight: {"600" if is_solana else "400"};">{p["name"][:12]}</span>',
+                    f'<span style="color: #555;">{chain}</span>',
+                    f'<span style="color: #e0e0e0;">{format_volume(vol)}</span>',
+                    ascii_bar_html(vol, max_global_vol, width=8, color=theme["accent"] if is_solana else "#555", total=global_total),
+                    f'<span style="color: {change_color};">{"▲" if change_1d > 0 else "▼" if change_1d < 0 else "─"}{abs(change_1d):.1f}%</span>',
+                ])
 
-        st.markdown(render_terminal_table(
-            headers=["#", "PROTOCOL", "CHAIN", "VOL_24H", "SHARE", "Δ24H"],
-            rows=comparison_rows
-        ), unsafe_allow_html=True)
+            return render_terminal_table(
+                headers=["#", "PROTOCOL", "CHAIN", "VOL_24H", "SHARE", "Δ24H"],
+                rows=comparison_rows
+            )
+
+        st.markdown(
+            cached_html("cross_chain_table", cache_mtime, st.session_state.terminal_theme, build_cross_chain_table),
+            unsafe_allow_html=True,
+        )
 
     with col2:
         # Bar chart for clearer comparison (better than pie for rankings)
-        with st.spinner("Loading chart..."):
+        def build_cross_chain_fig():
             top_10 = global_derivatives[:10]
-            colors = [theme["accent"] if "Solana" in p.get("chains", []) else "rgba(100, 116, 139, 0.5)" for p in top_10]
+            is_solana = [p["name"] in solana_names for p in top_10]
+            colors = [theme["accent"] if sol else "rgba(100, 116, 139, 0.5)" for sol in is_solana]
 
             fig = go.Figure(data=[
                 go.Bar(
                     x=[p["name"][:10] for p in top_10],
                     y=[p["volume_24h"] for p in top_10],
                     marker_color=colors,
-                    marker_line_color=[theme["accent"] if "Solana" in p.get("chains", []) else "rgba(100, 116, 139, 0.3)" for p in top_10],
+                    marker_line_color=[theme["accent"] if sol else "rgba(100, 116, 139, 0.3)" for sol in is_solana],
                     marker_line_width=1,
                     text=[format_volume(p["volume_24h"]) for p in top_10],
                     textposition="outside",
@@ -1293,7 +919,12 @@ if global_derivatives:
                 font=dict(size=10, color=PLOTLY_THEME["text_color"]),
             )
             apply_plotly_theme(fig)
-            st.plotly_chart(fig, use_container_width=True)
+            return fig
+
+        st.plotly_chart(
+            cached_figure("cross_chain", cache_mtime, st.session_state.terminal_theme, build_cross_chain_fig),
+            use_container_width=True,
+        )
 
     # Summary box - terminal style
     solana_share = (solana_total / global_total * 100) if global_total > 0 else 0
@@ -1319,38 +950,43 @@ col1, col2 = st.columns([1, 1])
 
 with col1:
     # Build terminal-style table with ASCII bars
-    max_vol = protocol_df["volume_24h"].max()
-    table_rows = []
-    for _, row in protocol_df.iterrows():
-        proto = row["protocol"]
-        vol = row["volume_24h"]
-        change_1d = row["change_1d"]
-        traders = row["traders"]
-        fees = row["fees"]
-
-        # Color for change
-        change_color = theme["positive"] if change_1d > 0 else theme["negative"] if change_1d < 0 else "#888"
-        change_str = f'<span style="color: {change_color};">{"▲" if change_1d > 0 else "▼" if change_1d < 0 else "─"} {abs(change_1d):.1f}%</span>'
-
-        # Protocol color
-        proto_color = PROTOCOL_COLORS.get(proto, theme["accent"])
-
+    def build_protocol_table():
+        max_vol = protocol_df["volume_24h"].max()
+        # Format whole columns up front instead of building a Series per row with iterrows
+        vol_strs = protocol_df["volume_24h"].map("${:,.0f}".format)
+        fee_strs = protocol_df["fees"].map("${:,.0f}".format)
         # Traders with asterisk for Pacifica
-        traders_str = f"{traders:,}*" if proto == "Pacifica" else f"{traders:,}"
-
-        table_rows.append([
-            f'<span style="color: {proto_color};">{proto}</span>',
-            f'<span style="color: #e0e0e0;">${vol:,.0f}</span>',
-            ascii_bar_html(vol, max_vol, width=12, color=proto_color, total=total_volume),
-            change_str,
-            f'<span style="color: #888;">{traders_str}</span>',
-            f'<span style="color: #666;">${fees:,.0f}</span>',
-        ])
-
-    st.markdown(render_terminal_table(
-        headers=["PROTOCOL", "VOL_24H", "SHARE", "Δ24H", "TRADERS", "FEES"],
-        rows=table_rows
-    ), unsafe_allow_html=True)
+        trader_strs = protocol_df["traders"].map("{:,}".format) + (protocol_df["protocol"] == "Pacifica").map({True: "*", False: ""})
+        table_rows = []
+        for proto, vol, change_1d, vol_str, traders_str, fees_str in zip(
+            protocol_df["protocol"], protocol_df["volume_24h"], protocol_df["change_1d"],
+            vol_strs, trader_strs, fee_strs,
+        ):
+            # Color for change
+            change_color = theme["positive"] if change_1d > 0 else theme["negative"] if change_1d < 0 else "#888"
+            change_str = f'<span style="color: {change_color};">{"▲" if change_1d > 0 else "▼" if change_1d < 0 else "─"} {abs(change_1d):.1f}%</span>'
+
+            # Protocol color
+            proto_color = PROTOCOL_COLORS.get(proto, theme["accent"])
+
+            table_rows.append([
+                f'<span style="color: {proto_color};">{proto}</span>',
+                f'<span style="color: #e0e0e0;">{vol_str}</span>',
+                ascii_bar_html(vol, max_vol, width=12, color=proto_color, total=total_volume),
+                change_str,
+                f'<span style="color: #888;">{traders_str}</span>',
+                f'<span style="color: #666;">{fees_str}</span>',
+            ])
+
+        return render_terminal_table(
+            headers=["PROTOCOL", "VOL_24H", "SHARE", "Δ24H", "TRADERS", "FEES"],
+            rows=table_rows
+        )
+
+    st.markdown(
+        cached_html("protocol_table", cache_mtime, st.session_state.terminal_theme, build_protocol_table),
+        unsafe_allow_html=True,
+    )
 
     # Footnote
     if "Pacifica" in protocol_df["protocol"].values:
@@ -1358,7 +994,7 @@ with col1:
 
 with col2:
     # Solana protocols pie chart with premium styling
-    with st.spinner("Loading chart..."):
+    def build_protocol_share_fig():
         # Use protocol-specific colors
         protocol_colors = [PROTOCOL_COLORS.get(p, PROTOCOL_COLORS["default"]) for p in protocol_df["protocol"]]
 
@@ -1388,7 +1024,12 @@ with col2:
             )]
         )
         apply_plotly_theme(fig)
-        st.plotly_chart(fig, use_container_width=True)
+        return fig
+
+    st.plotly_chart(
+        cached_figure("protocol_share", cache_mtime, st.session_state.terminal_theme, build_protocol_share_fig),
+        use_container_width=True,
+    )
 
 st.divider()
 
@@ -1396,66 +1037,44 @@ st.divider()
 st.markdown(terminal_section_header("Best Venue by Asset"), unsafe_allow_html=True)
 st.caption("> Compare trading venues for each asset")
 
-drift_markets = cache.get("drift_markets", {})
-jupiter_markets = cache.get("jupiter_markets", {})
 
-# Dynamically derive common assets from available markets
-drift_asset_names = {m.replace("-PERP", "") for m in drift_markets.keys() if m.endswith("-PERP")}
-jupiter_asset_names = set(jupiter_markets.get("volumes", {}).keys())
-common_assets = sorted(drift_asset_names & jupiter_asset_names)
-
-# Fallback: if no common assets found, use top assets by combined volume
-if not common_assets:
-    combined = {}
-    for asset in drift_asset_names | jupiter_asset_names:
-        drift_vol = drift_markets.get(f"{asset}-PERP", {}).get("volume", 0)
-        jup_vol = jupiter_markets.get("volumes", {}).get(asset, 0)
-        combined[asset] = drift_vol + jup_vol
-    common_assets = sorted(combined.keys(), key=lambda x: combined[x], reverse=True)[:8]
-
-# Limit to top 8 assets for display
-common_assets = common_assets[:8] if len(common_assets) > 8 else common_assets
-
-venue_rows = []
-max_combined_vol = max(
-    (drift_markets.get(f"{a}-PERP", {}).get("volume", 0) + jupiter_markets.get("volumes", {}).get(a, 0))
-    for a in common_assets
-) if common_assets else 1
-
-for asset in common_assets:
-    drift_key = f"{asset}-PERP"
-    drift_info = drift_markets.get(drift_key, {})
-
-    jupiter_vol = jupiter_markets.get("volumes", {}).get(asset, 0)
-    drift_vol = drift_info.get("volume", 0)
-    drift_funding = drift_info.get("funding_rate", 0)
-    drift_oi = drift_info.get("open_interest", 0)
-    drift_price = drift_info.get("last_price", 0)
-
-    # Determine winner
-    if jupiter_vol > drift_vol:
-        winner = f'<span style="color: {PROTOCOL_COLORS["Jupiter"]};">JUP</span>'
-    elif drift_vol > jupiter_vol:
-        winner = f'<span style="color: {PROTOCOL_COLORS["Drift"]};">DRIFT</span>'
-    else:
-        winner = '<span style="color: #555;">TIE</span>'
+def build_venue_table():
+    venue_df = pd.DataFrame(
+        derived["venue_comparison"],
+        columns=["asset", "drift_volume", "jupiter_volume", "drift_funding", "drift_oi_usd"],
+    )
 
-    # Funding color
-    fund_color = theme["positive"] if drift_funding < 0 else theme["negative"] if drift_funding > 0 else "#888"
+    # Build each HTML column in one pass instead of formatting row by row
+    drift_wins = venue_df["drift_volume"] > venue_df["jupiter_volume"]
+    jupiter_wins = venue_df["jupiter_volume"] > venue_df["drift_volume"]
+    venue_best = (
+        pd.Series('<span style="color: #555;">TIE</span>', index=venue_df.index)
+        .mask(drift_wins, f'<span style="color: {PROTOCOL_COLORS["Drift"]};">DRIFT</span>')
+        .mask(jupiter_wins, f'<span style="color: {PROTOCOL_COLORS["Jupiter"]};">JUP</span>')
+    )
+    venue_html = pd.DataFrame({
+        "asset": '<span style="color: #e0e0e0; font-weight: 600;">' + venue_df["asset"] + '</span>',
+        "drift_volume": f'<span style="color: {PROTOCOL_COLORS["Drift"]};">'
+                        + venue_df["drift_volume"].map("${:,.0f}".format) + '</span>',
+        "jupiter_volume": f'<span style="color: {PROTOCOL_COLORS["Jupiter"]};">'
+                          + venue_df["jupiter_volume"].map("${:,.0f}".format) + '</span>',
+        "best": venue_best,
+        "funding": '<span style="color: ' + funding_colors(venue_df["drift_funding"]) + ';">'
+                   + (venue_df["drift_funding"] * 100).map("{:+.4f}%".format) + '</span>',
+        "oi": '<span style="color: #888;">' + venue_df["drift_oi_usd"].map("${:,.0f}".format) + '</span>',
+    })
+    venue_rows = venue_html.values.tolist()
+
+    return render_terminal_table(
+        headers=["ASSET", "DRIFT_VOL", "JUP_VOL", "BEST", "FUNDING", "OI"],
+        rows=venue_rows
+    )
 
-    venue_rows.append([
-        f'<span style="color: #e0e0e0; font-weight: 600;">{asset}</span>',
-        f'<span style="color: {PROTOCOL_COLORS["Drift"]};">${drift_vol:,.0f}</span>',
-        f'<span style="color: {PROTOCOL_COLORS["Jupiter"]};">${jupiter_vol:,.0f}</span>',
-        winner,
-        f'<span style="color: {fund_color};">{drift_funding*100:+.4f}%</span>',
-        f'<span style="color: #888;">${drift_oi * drift_price:,.0f}</span>',
-    ])
 
-st.markdown(render_terminal_table(
-    headers=["ASSET", "DRIFT_VOL", "JUP_VOL", "BEST", "FUNDING", "OI"],
-    rows=venue_rows
-), unsafe_allow_html=True)
+st.markdown(
+    cached_html("venue_table", cache_mtime, st.session_state.terminal_theme, build_venue_table),
+    unsafe_allow_html=True,
+)
 
 st.divider()
 
@@ -1464,44 +1083,34 @@ st.markdown(terminal_section_header("Funding Rates"), unsafe_allow_html=True)
 
 col1, col2 = st.columns([2, 1])
 
-def is_valid_funding_market(info: dict) -> bool:
-    """Filter for valid funding rate markets: min OI and reasonable funding."""
-    oi_usd = info.get("open_interest", 0) * info.get("last_price", 0)
-    funding = abs(info.get("funding_rate", 0))
-    return oi_usd >= 10000 and funding < 0.05  # $10k OI min, <5% funding
+# Valid funding markets (min OI, reasonable funding), lowest rate first
+funding_markets = derived["funding_markets"]
 
 with col1:
     if drift_markets:
-        with st.spinner("Loading chart..."):
+        def build_funding_fig():
             # Get markets sorted by absolute funding rate (most extreme first)
-            sorted_markets = sorted(
-                [(k, v) for k, v in drift_markets.items()
-                 if v.get("volume", 0) > 10000 and is_valid_funding_market(v)],
-                key=lambda x: abs(x[1].get("funding_rate", 0)),
-                reverse=True
-            )[:12]
-
-            funding_data = []
-            for market, info in sorted_markets:
-                funding = info.get("funding_rate", 0) * 100  # Convert to percentage
-                funding_data.append({
-                    "Market": market.replace("-PERP", ""),
-                    "Funding %": funding,
-                    "Direction": "Longs Pay" if funding > 0 else "Shorts Pay" if funding < 0 else "Neutral",
-                })
-
-            funding_df = pd.DataFrame(funding_data)
+            sorted_markets = heapq.nlargest(12, funding_markets, key=lambda x: abs(x[1]))
+
+            # Plain lists for Plotly; a DataFrame only adds overhead for 12 rows
+            market_names = []
+            funding_pcts = []
+            colors = []
+            for market, funding_rate in sorted_markets:
+                funding = funding_rate * 100  # Convert to percentage
+                market_names.append(market.replace("-PERP", ""))
+                funding_pcts.append(funding)
+                colors.append(PLOTLY_THEME["negative"] if funding > 0 else PLOTLY_THEME["positive"])
 
             # Create bar chart with themed colors
-            colors = [PLOTLY_THEME["negative"] if f > 0 else PLOTLY_THEME["positive"] for f in funding_df["Funding %"]]
             fig = go.Figure(data=[
                 go.Bar(
-                    x=funding_df["Market"],
-                    y=funding_df["Funding %"],
+                    x=market_names,
+                    y=funding_pcts,
                     marker_color=colors,
                     marker_line_color=colors,
                     marker_line_width=1,
-                    text=[f"{f:.4f}%" for f in funding_df["Funding %"]],
+                    text=[f"{f:.4f}%" for f in funding_pcts],
                     textposition="outside",
                     textfont=dict(size=9, color=PLOTLY_THEME["text_color"]),
                     hovertemplate="<b>%{x}</b><br>Funding: %{y:.4f}%<extra></extra>",
@@ -1523,7 +1132,12 @@ with col1:
                 font=dict(size=9, color=PLOTLY_THEME["text_color"]),
             )
             apply_plotly_theme(fig)
-            st.plotly_chart(fig, use_container_width=True)
+            return fig
+
+        st.plotly_chart(
+            cached_figure("funding", cache_mtime, st.session_state.terminal_theme, build_funding_fig),
+            use_container_width=True,
+        )
 
 with col2:
     st.markdown(f"""
@@ -1531,21 +1145,16 @@ with col2:
     """, unsafe_allow_html=True)
 
     if drift_markets:
-        # Filter for valid markets (min OI, reasonable funding)
-        valid_markets = [(k, v) for k, v in drift_markets.items()
-                         if v.get("volume", 0) > 10000 and is_valid_funding_market(v)]
-        sorted_by_funding = sorted(valid_markets, key=lambda x: x[1].get("funding_rate", 0))
-
-        if sorted_by_funding:
-            lowest = sorted_by_funding[0]
-            highest = sorted_by_funding[-1]
+        if funding_markets:
+            lowest = funding_markets[0]
+            highest = funding_markets[-1]
 
             st.markdown(f"""
             <div style="background: #0d0d0d; border: 1px solid #333; padding: 0.75rem; margin-bottom: 0.5rem; font-size: 0.75rem;">
                 <div style="color: #555; font-size: 0.65rem; text-transform: uppercase; letter-spacing: 0.08em; margin-bottom: 0.5rem;">SHORTS_PAY_MOST</div>
                 <div style="display: flex; align-items: center; justify-content: space-between;">
                     <span style="color: #e0e0e0;">{lowest[0].replace("-PERP", "")}</span>
-                    <span style="color: {theme['positive']};">{format_funding(lowest[1].get('funding_rate', 0))}</span>
+                    <span style="color: {theme['positive']};">{format_funding(lowest[1])}</span>
                 </div>
             </div>
 
@@ -1553,7 +1162,7 @@ with col2:
                 <div style="color: #555; font-size: 0.65rem; text-transform: uppercase; letter-spacing: 0.08em; margin-bottom: 0.5rem;">LONGS_PAY_MOST</div>
                 <div style="display: flex; align-items: center; justify-content: space-between;">
                     <span style="color: #e0e0e0;">{highest[0].replace("-PERP", "")}</span>
-                    <span style="color: {theme['negative']};">{format_funding(highest[1].get('funding_rate', 0))}</span>
+                    <span style="color: {theme['negative']};">{format_funding(highest[1])}</span>
                 </div>
             </div>
             """, unsafe_allow_html=True)
@@ -1561,107 +1170,182 @@ with col2:
 st.divider()
 
 # Market Deep Dive
-st.markdown(terminal_section_header("Market Deep Dive"), unsafe_allow_html=True)
-
-window_data = get_time_window_data(cache, time_window)
-pacifica_markets = cache.get("pacifica_markets", {})
+@st.fragment
+def render_time_window_sections():
+    """Sections driven by the time window selector.
 
-col1, col2, col3 = st.columns(3)
+    Runs as a fragment, so changing the window reruns only this block instead
+    of the whole page.
+    """
+    st.markdown(terminal_section_header("Market Deep Dive"), unsafe_allow_html=True)
 
-with col1:
-    drift_traders = window_data.get("drift_traders", 0)
+    # Time window selector - terminal style
     st.markdown(f"""
-    <div style="color: {PROTOCOL_COLORS['Drift']}; font-size: 0.8rem; font-weight: 600; margin-bottom: 0.5rem;">
-        DRIFT <span style="color: #888; font-weight: 400;">({drift_traders:,}/{time_window})</span>
-    </div>
+    <div style="font-size: 0.65rem; text-transform: uppercase; letter-spacing: 0.1em; color: #555; margin-bottom: 0.5rem;">[ TIME_WINDOW ]</div>
     """, unsafe_allow_html=True)
 
-    if drift_markets:
-        total_vol = sum(m["volume"] for m in drift_markets.values())
-        max_vol = max(m["volume"] for m in drift_markets.values())
-        sorted_markets = sorted(drift_markets.items(), key=lambda x: x[1]["volume"], reverse=True)[:10]
-
-        drift_rows = []
-        for market, info in sorted_markets:
-            vol = info["volume"]
-            funding = info.get("funding_rate", 0)
-            fund_color = theme["positive"] if funding < 0 else theme["negative"] if funding > 0 else "#888"
-
-            drift_rows.append([
-                f'<span style="color: #e0e0e0;">{market.replace("-PERP", "")}</span>',
-                f'<span style="color: #888;">${vol/1e6:.1f}M</span>',
-                ascii_bar_html(vol, max_vol, width=8, color=PROTOCOL_COLORS["Drift"], total=total_vol),
-                f'<span style="color: {fund_color};">{funding*100:+.3f}%</span>',
-            ])
+    time_window = st.radio(
+        "Time Window",
+        options=["1h", "4h", "8h", "24h"],
+        index=0,
+        horizontal=True,
+        help="Select time window for trader counts and liquidations",
+        label_visibility="collapsed"
+    )
 
-        st.markdown(render_terminal_table(
-            headers=["MKT", "VOL", "SHARE", "FUND"],
-            rows=drift_rows
-        ), unsafe_allow_html=True)
+    window_data = get_time_window_data(cache, time_window)
+    pacifica_markets = cache.get("pacifica_markets", {})
 
-with col2:
-    jupiter_traders = window_data.get("jupiter_traders", 0)
-    st.markdown(f"""
-    <div style="color: {PROTOCOL_COLORS['Jupiter']}; font-size: 0.8rem; font-weight: 600; margin-bottom: 0.5rem;">
-        JUPITER <span style="color: #888; font-weight: 400;">({jupiter_traders:,}/{time_window})</span>
-    </div>
-    """, unsafe_allow_html=True)
+    col1, col2, col3 = st.columns(3)
 
-    jupiter_trades = jupiter_markets.get("trades", {})
-    jupiter_volumes = jupiter_markets.get("volumes", {})
+    with col1:
+        drift_traders = window_data.get("drift_traders", 0)
+        st.markdown(f"""
+        <div style="color: {PROTOCOL_COLORS['Drift']}; font-size: 0.8rem; font-weight: 600; margin-bottom: 0.5rem;">
+            DRIFT <span style="color: #888; font-weight: 400;">({drift_traders:,}/{time_window})</span>
+        </div>
+        """, unsafe_allow_html=True)
 
-    if jupiter_trades:
-        total_trades = sum(jupiter_trades.values())
-        max_trades = max(jupiter_trades.values())
+        if drift_markets:
+            def build_drift_markets_table():
+                drift_df = base_drift_df(cache_mtime)
+                total_vol = drift_df["volume"].sum()
+                top_markets = drift_df.nlargest(10, "volume")
+                max_vol = top_markets["volume"].iat[0]  # nlargest is sorted, so the max leads
+
+                market_html = '<span style="color: #e0e0e0;">' + top_markets.index.str.replace("-PERP", "") + '</span>'
+                vol_html = '<span style="color: #888;">' + (top_markets["volume"] / 1e6).map("${:.1f}M".format) + '</span>'
+                fund_html = ('<span style="color: ' + funding_colors(top_markets["funding_rate"]) + ';">'
+                             + (top_markets["funding_rate"] * 100).map("{:+.3f}%".format) + '</span>')
+
+                drift_rows = [
+                    [market, vol_str, ascii_bar_html(vol, max_vol, width=8, color=PROTOCOL_COLORS["Drift"], total=total_vol), fund]
+                    for market, vol_str, vol, fund in zip(market_html, vol_html, top_markets["volume"], fund_html)
+                ]
+
+                return render_terminal_table(
+                    headers=["MKT", "VOL", "SHARE", "FUND"],
+                    rows=drift_rows
+                )
 
-        jupiter_rows = []
-        for market in sorted(jupiter_trades.keys(), key=lambda x: jupiter_trades[x], reverse=True)[:10]:
-            trades = jupiter_trades[market]
-            vol = jupiter_volumes.get(market, 0)
+            st.markdown(
+                cached_html("drift_markets_table", cache_mtime, st.session_state.terminal_theme, build_drift_markets_table),
+                unsafe_allow_html=True,
+            )
 
-            jupiter_rows.append([
-                f'<span style="color: #e0e0e0;">{market}</span>',
-                f'<span style="color: #888;">{trades:,}</span>',
-                f'<span style="color: #888;">${vol/1e6:.1f}M</span>',
-                ascii_bar_html(trades, max_trades, width=8, color=PROTOCOL_COLORS["Jupiter"], total=total_trades),
-            ])
+    with col2:
+        jupiter_traders = window_data.get("jupiter_traders", 0)
+        st.markdown(f"""
+        <div style="color: {PROTOCOL_COLORS['Jupiter']}; font-size: 0.8rem; font-weight: 600; margin-bottom: 0.5rem;">
+            JUPITER <span style="color: #888; font-weight: 400;">({jupiter_traders:,}/{time_window})</span>
+        </div>
+        """, unsafe_allow_html=True)
 
-        st.markdown(render_terminal_table(
-            headers=["MKT", "TRADES", "VOL", "SHARE"],
-            rows=jupiter_rows
-        ), unsafe_allow_html=True)
+        jupiter_trades = jupiter_markets.get("trades", {})
+        jupiter_volumes = jupiter_markets.get("volumes", {})
+
+        if jupiter_trades:
+            def build_jupiter_markets_table():
+                jupiter_df = pd.DataFrame({"trades": pd.Series(jupiter_trades)})
+                jupiter_df["volume"] = pd.Series(jupiter_volumes).reindex(jupiter_df.index, fill_value=0)
+                total_trades = jupiter_df["trades"].sum()
+                top_markets = jupiter_df.nlargest(10, "trades")
+                max_trades = top_markets["trades"].iat[0]
+
+                market_html = '<span style="color: #e0e0e0;">' + top_markets.index.astype(str) + '</span>'
+                trades_html = '<span style="color: #888;">' + top_markets["trades"].map("{:,}".format) + '</span>'
+                vol_html = '<span style="color: #888;">' + (top_markets["volume"] / 1e6).map("${:.1f}M".format) + '</span>'
+
+                jupiter_rows = [
+                    [market, trades_str, vol_str,
+                     ascii_bar_html(trades, max_trades, width=8, color=PROTOCOL_COLORS["Jupiter"], total=total_trades)]
+                    for market, trades_str, vol_str, trades in zip(market_html, trades_html, vol_html, top_markets["trades"])
+                ]
+
+                return render_terminal_table(
+                    headers=["MKT", "TRADES", "VOL", "SHARE"],
+                    rows=jupiter_rows
+                )
 
-with col3:
-    pacifica_traders = window_data.get("pacifica_traders", 0)
-    st.markdown(f"""
-    <div style="color: {PROTOCOL_COLORS['Pacifica']}; font-size: 0.8rem; font-weight: 600; margin-bottom: 0.5rem;">
-        PACIFICA <span style="color: #888; font-weight: 400;">({pacifica_traders:,}/{time_window})</span>
-    </div>
-    """, unsafe_allow_html=True)
+            st.markdown(
+                cached_html("jupiter_markets_table", cache_mtime, st.session_state.terminal_theme, build_jupiter_markets_table),
+                unsafe_allow_html=True,
+            )
 
-    if pacifica_markets:
-        sorted_pac_markets = sorted(pacifica_markets.items(), key=lambda x: x[1].get("max_leverage", 0), reverse=True)[:10]
-        max_lev = max(m.get("max_leverage", 0) for _, m in sorted_pac_markets)
+    with col3:
+        pacifica_traders = window_data.get("pacifica_traders", 0)
+        st.markdown(f"""
+        <div style="color: {PROTOCOL_COLORS['Pacifica']}; font-size: 0.8rem; font-weight: 600; margin-bottom: 0.5rem;">
+            PACIFICA <span style="color: #888; font-weight: 400;">({pacifica_traders:,}/{time_window})</span>
+        </div>
+        """, unsafe_allow_html=True)
 
-        pacifica_rows = []
-        for market, info in sorted_pac_markets:
-            funding = info.get("funding_rate", 0)
-            leverage = info.get("max_leverage", 0)
-            fund_color = theme["positive"] if funding < 0 else theme["negative"] if funding > 0 else "#888"
+        if pacifica_markets:
+            def build_pacifica_markets_table():
+                sorted_pac_markets = heapq.nlargest(10, pacifica_markets.items(), key=lambda x: x[1].get("max_leverage", 0))
+
+                pacifica_rows = []
+                for market, info in sorted_pac_markets:
+                    funding = info.get("funding_rate", 0)
+                    leverage = info.get("max_leverage", 0)
+                    fund_color = theme["positive"] if funding < 0 else theme["negative"] if funding > 0 else "#888"
+
+                    pacifica_rows.append([
+                        f'<span style="color: #e0e0e0;">{market}</span>',
+                        f'<span style="color: {fund_color};">{funding*100:+.3f}%</span>',
+                        f'<span style="color: {PROTOCOL_COLORS["Pacifica"]};">{leverage}x</span>',
+                    ])
+
+                return render_terminal_table(
+                    headers=["MKT", "FUND", "LEV"],
+                    rows=pacifica_rows
+                )
 
-            pacifica_rows.append([
-                f'<span style="color: #e0e0e0;">{market}</span>',
-                f'<span style="color: {fund_color};">{funding*100:+.3f}%</span>',
-                f'<span style="color: {PROTOCOL_COLORS["Pacifica"]};">{leverage}x</span>',
-            ])
+            st.markdown(
+                cached_html("pacifica_markets_table", cache_mtime, st.session_state.terminal_theme, build_pacifica_markets_table),
+                unsafe_allow_html=True,
+            )
+            st.caption("49 markets · Volume not available")
+        else:
+            st.caption("Market data loading...")
 
-        st.markdown(render_terminal_table(
-            headers=["MKT", "FUND", "LEV"],
-            rows=pacifica_rows
-        ), unsafe_allow_html=True)
-        st.caption("49 markets · Volume not available")
-    else:
-        st.caption("Market data loading...")
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.subheader(f"Active Traders ({time_window})")
+        insights_window = window_data
+        drift_count = insights_window.get("drift_traders", 0)
+        jupiter_count = insights_window.get("jupiter_traders", 0)
+        pacifica_count = insights_window.get("pacifica_traders", 0)
+        if drift_count > 0 or jupiter_count > 0 or pacifica_count > 0:
+            st.metric("Drift", f"{drift_count:,}")
+            st.metric("Jupiter", f"{jupiter_count:,}")
+            st.metric(
+                "Pacifica",
+                f"{pacifica_count:,}",
+                help="Pacifica uses hybrid architecture (off-chain CLOB, on-chain settlement). This count represents active on-chain users, not all traders. May undercount due to off-chain activity, or overcount depositors who haven't traded."
+            )
+        else:
+            st.write("No trader data available")
+
+    with col2:
+        st.subheader(f"Liquidations ({time_window})")
+        liquidations = insights_window.get("liquidations", {})
+        if liquidations.get("error"):
+            st.warning(f"Liquidations unavailable for {time_window}")
+            if "timeout" in liquidations.get("error", "").lower() or "skipped" in liquidations.get("error", "").lower():
+                st.caption("Liquidation queries time out beyond 8h. Try a shorter window.")
+            else:
+                st.caption(liquidations.get("error", "Unknown error"))
+        elif liquidations.get("count", 0) > 0:
+            st.metric("Events", f"{liquidations['count']:,}")
+            st.write(f"Txns: {liquidations.get('txns', 0):,}")
+        else:
+            st.info("No liquidations")
+        st.caption("Source: Drift")
+
+
+render_time_window_sections()
 
 st.divider()
 
@@ -1669,6 +1353,12 @@ st.divider()
 st.markdown(terminal_section_header("Cross-Platform Traders (24h)"), unsafe_allow_html=True)
 st.caption("> Wallet overlap: Drift × Jupiter × Pacifica")
 
+# Overlap categories in cache["time_windows"]["24h"]["wallet_overlap"], in unpacking order
+WALLET_OVERLAP_KEYS = (
+    "drift_only", "jupiter_only", "pacifica_only", "drift_jupiter", "drift_pacifica",
+    "jupiter_pacifica", "all_three", "multi_platform",
+)
+
 # Always use 24h wallet data for consistency (Pacifica API only provides 24h granularity)
 wallet_data = cache.get("time_windows", {}).get("24h", {}).get("wallet_overlap", {})
 
@@ -1676,20 +1366,15 @@ if wallet_data.get("error"):
     st.warning(f"Wallet data unavailable: {wallet_data.get('error', 'Unknown error')}")
 else:
     # Extract all overlap categories
-    drift_only = wallet_data.get("drift_only", 0)
-    jupiter_only = wallet_data.get("jupiter_only", 0)
-    pacifica_only = wallet_data.get("pacifica_only", 0)
-    drift_jupiter = wallet_data.get("drift_jupiter", 0)
-    drift_pacifica = wallet_data.get("drift_pacifica", 0)
-    jupiter_pacifica = wallet_data.get("jupiter_pacifica", 0)
-    all_three = wallet_data.get("all_three", 0)
-    multi = wallet_data.get("multi_platform", 0)
-
-    # Calculate totals per platform
+    (drift_only, jupiter_only, pacifica_only, drift_jupiter, drift_pacifica,
+     jupiter_pacifica, all_three, multi) = [wallet_data.get(key, 0) for key in WALLET_OVERLAP_KEYS]
+
+    # Calculate totals per platform; the seven categories are disjoint, so
+    # the overall total is Drift's total plus the wallets not on Drift
     drift_total = drift_only + drift_jupiter + drift_pacifica + all_three
     jupiter_total = jupiter_only + drift_jupiter + jupiter_pacifica + all_three
     pacifica_total = pacifica_only + drift_pacifica + jupiter_pacifica + all_three
-    total = drift_only + jupiter_only + pacifica_only + drift_jupiter + drift_pacifica + jupiter_pacifica + all_three
+    total = drift_total + jupiter_only + pacifica_only + jupiter_pacifica
 
     if total > 0:
         # Top metrics row
@@ -1746,96 +1431,107 @@ else:
             overlap_pct = (multi / total * 100) if total > 0 else 0
             st.metric("Overlap Rate", f"{overlap_pct:.1f}%", help="Percentage of traders using 2+ platforms")
 
-        # Visualization row
-        col1, col2 = st.columns([1, 1])
+        # Visualization row; hiding it skips sending both figures to the browser
+        if st.toggle("Show overlap charts", value=True, key="show_wallet_charts"):
+            col1, col2 = st.columns([1, 1])
+
+            with col1:
+                def build_trader_distribution_fig():
+                    # Pie chart with all categories
+                    labels = []
+                    values = []
+                    colors = []
+
+                    if all_three > 0:
+                        labels.append("All Three")
+                        values.append(all_three)
+                        colors.append(theme["accent"])
+                    if drift_jupiter > 0:
+                        labels.append("Drift+Jupiter")
+                        values.append(drift_jupiter)
+                        colors.append("#7C3AED")
+                    if drift_pacifica > 0:
+                        labels.append("Drift+Pacifica")
+                        values.append(drift_pacifica)
+                        colors.append("#8B5CF6")
+                    if jupiter_pacifica > 0:
+                        labels.append("Jupiter+Pacifica")
+                        values.append(jupiter_pacifica)
+                        colors.append("#A78BFA")
+                    if drift_only > 0:
+                        labels.append("Drift Only")
+                        values.append(drift_only)
+                        colors.append(PROTOCOL_COLORS["Drift"])
+                    if jupiter_only > 0:
+                        labels.append("Jupiter Only")
+                        values.append(jupiter_only)
+                        colors.append(PROTOCOL_COLORS["Jupiter"])
+                    if pacifica_only > 0:
+                        labels.append("Pacifica Only")
+                        values.append(pacifica_only)
+                        colors.append(PROTOCOL_COLORS["Pacifica"])
+
+                    fig = go.Figure(data=[go.Pie(
+                        labels=labels,
+                        values=values,
+                        hole=0.55,
+                        marker=dict(
+                            colors=colors,
+                            line=dict(color=PLOTLY_THEME["bg_color"], width=2)
+                        ),
+                        textinfo="label+percent",
+                        textposition="outside",
+                        textfont=dict(size=9, color=PLOTLY_THEME["text_color"]),
+                        hovertemplate="<b>%{label}</b><br>Traders: %{value:,}<br>Share: %{percent}<extra></extra>",
+                    )])
+                    fig.update_layout(
+                        title=dict(text="Trader Distribution", font=dict(size=14)),
+                        showlegend=False,
+                        height=320,
+                        annotations=[dict(
+                            text=f"<b>{total:,}</b><br>traders",
+                            x=0.5, y=0.5,
+                            font=dict(size=12, color=PLOTLY_THEME["title_color"], family="JetBrains Mono, monospace"),
+                            showarrow=False
+                        )]
+                    )
+                    apply_plotly_theme(fig)
+                    return fig
 
-        with col1:
-            with st.spinner("Loading chart..."):
-                # Pie chart with all categories
-                labels = []
-                values = []
-                colors = []
-
-                if all_three > 0:
-                    labels.append("All Three")
-                    values.append(all_three)
-                    colors.append(theme["accent"])
-                if drift_jupiter > 0:
-                    labels.append("Drift+Jupiter")
-                    values.append(drift_jupiter)
-                    colors.append("#7C3AED")
-                if drift_pacifica > 0:
-                    labels.append("Drift+Pacifica")
-                    values.append(drift_pacifica)
-                    colors.append("#8B5CF6")
-                if jupiter_pacifica > 0:
-                    labels.append("Jupiter+Pacifica")
-                    values.append(jupiter_pacifica)
-                    colors.append("#A78BFA")
-                if drift_only > 0:
-                    labels.append("Drift Only")
-                    values.append(drift_only)
-                    colors.append(PROTOCOL_COLORS["Drift"])
-                if jupiter_only > 0:
-                    labels.append("Jupiter Only")
-                    values.append(jupiter_only)
-                    colors.append(PROTOCOL_COLORS["Jupiter"])
-                if pacifica_only > 0:
-                    labels.append("Pacifica Only")
-                    values.append(pacifica_only)
-                    colors.append(PROTOCOL_COLORS["Pacifica"])
-
-                fig = go.Figure(data=[go.Pie(
-                    labels=labels,
-                    values=values,
-                    hole=0.55,
-                    marker=dict(
-                        colors=colors,
-                        line=dict(color=PLOTLY_THEME["bg_color"], width=2)
-                    ),
-                    textinfo="label+percent",
-                    textposition="outside",
-                    textfont=dict(size=9, color=PLOTLY_THEME["text_color"]),
-                    hovertemplate="<b>%{label}</b><br>Traders: %{value:,}<br>Share: %{percent}<extra></extra>",
-                )])
-                fig.update_layout(
-                    title=dict(text="Trader Distribution", font=dict(size=14)),
-                    showlegend=False,
-                    height=320,
-                    annotations=[dict(
-                        text=f"<b>{total:,}</b><br>traders",
-                        x=0.5, y=0.5,
-                        font=dict(size=12, color=PLOTLY_THEME["title_color"], family="JetBrains Mono, monospace"),
-                        showarrow=False
-                    )]
+                st.plotly_chart(
+                    cached_figure("trader_distribution", cache_mtime, st.session_state.terminal_theme, build_trader_distribution_fig),
+                    use_container_width=True,
                 )
-                apply_plotly_theme(fig)
-                st.plotly_chart(fig, use_container_width=True)
 
-        with col2:
-            with st.spinner("Loading chart..."):
-                # Bar chart showing totals per platform
-                fig = go.Figure(data=[
-                    go.Bar(
-                        x=["Drift", "Jupiter", "Pacifica"],
-                        y=[drift_total, jupiter_total, pacifica_total],
-                        marker_color=[PROTOCOL_COLORS["Drift"], PROTOCOL_COLORS["Jupiter"], PROTOCOL_COLORS["Pacifica"]],
-                        marker_line_color=[PROTOCOL_COLORS["Drift"], PROTOCOL_COLORS["Jupiter"], PROTOCOL_COLORS["Pacifica"]],
-                        marker_line_width=1,
-                        text=[f"{drift_total:,}", f"{jupiter_total:,}", f"{pacifica_total:,}"],
-                        textposition="outside",
-                        textfont=dict(size=11, color=PLOTLY_THEME["text_color"]),
-                        hovertemplate="<b>%{x}</b><br>Traders: %{y:,}<extra></extra>",
+            with col2:
+                def build_platform_traders_fig():
+                    # Bar chart showing totals per platform
+                    fig = go.Figure(data=[
+                        go.Bar(
+                            x=["Drift", "Jupiter", "Pacifica"],
+                            y=[drift_total, jupiter_total, pacifica_total],
+                            marker_color=[PROTOCOL_COLORS["Drift"], PROTOCOL_COLORS["Jupiter"], PROTOCOL_COLORS["Pacifica"]],
+                            marker_line_color=[PROTOCOL_COLORS["Drift"], PROTOCOL_COLORS["Jupiter"], PROTOCOL_COLORS["Pacifica"]],
+                            marker_line_width=1,
+                            text=[f"{drift_total:,}", f"{jupiter_total:,}", f"{pacifica_total:,}"],
+                            textposition="outside",
+                            textfont=dict(size=11, color=PLOTLY_THEME["text_color"]),
+                            hovertemplate="<b>%{x}</b><br>Traders: %{y:,}<extra></extra>",
+                        )
+                    ])
+                    fig.update_layout(
+                        title=dict(text="Total Traders by Platform (24h)", font=dict(size=14)),
+                        yaxis_title="Unique Wallets",
+                        height=320,
+                        bargap=0.4,
                     )
-                ])
-                fig.update_layout(
-                    title=dict(text="Total Traders by Platform (24h)", font=dict(size=14)),
-                    yaxis_title="Unique Wallets",
-                    height=320,
-                    bargap=0.4,
+                    apply_plotly_theme(fig)
+                    return fig
+
+                st.plotly_chart(
+                    cached_figure("platform_traders", cache_mtime, st.session_state.terminal_theme, build_platform_traders_fig),
+                    use_container_width=True,
                 )
-                apply_plotly_theme(fig)
-                st.plotly_chart(fig, use_container_width=True)
     else:
         st.info("No wallet data available for the current period")
 
@@ -1873,8 +1569,10 @@ else:
             )
 
         with col3:
-            # Calculate total recent txns
-            total_recent_txns = sum(w.get("txn_count_1h", 0) for w in whales)
+            # Total recent txns, summed at fetch time (caches written before that lack it)
+            total_recent_txns = whale_data.get("txn_count_1h")
+            if total_recent_txns is None:
+                total_recent_txns = sum(w.get("txn_count_1h", 0) for w in whales)
             st.metric(
                 "Whale Txns (1h)",
                 f"{total_recent_txns}",
@@ -1882,38 +1580,44 @@ else:
             )
 
         # Whale activity table
-        whale_rows = []
-        for whale in whales[:10]:  # Show top 10
-            addr = whale.get("address", "")
-            short_addr = f"{addr[:4]}...{addr[-4:]}" if len(addr) > 8 else addr
-            source = whale.get("source", "").upper()[:3]
-            pnl = whale.get("pnl_24h", 0)
-            vol = whale.get("volume", 0)
-            txn_1h = whale.get("txn_count_1h", 0)
-            is_active = whale.get("is_active", False)
-
-            # Activity indicator
-            status = f'<span style="color: {theme["positive"]};">●</span>' if is_active else f'<span style="color: #333;">○</span>'
-
-            # PnL color
-            pnl_color = theme["positive"] if pnl > 0 else theme["negative"] if pnl < 0 else "#888"
-            pnl_str = f"+${pnl:,.0f}" if pnl > 0 else f"-${abs(pnl):,.0f}" if pnl < 0 else "$0"
-
-            source_color = PROTOCOL_COLORS.get("Pacifica", theme["accent"]) if source == "PAC" else PROTOCOL_COLORS.get("Jupiter", theme["accent"])
-
-            whale_rows.append([
-                status,
-                f'<span style="color: #e0e0e0;">{short_addr}</span>',
-                f'<span style="color: {source_color};">{source}</span>',
-                f'<span style="color: {pnl_color};">{pnl_str}</span>',
-                f'<span style="color: #888;">${vol:,.0f}</span>',
-                f'<span style="color: {theme["accent"] if txn_1h > 0 else "#555"};">{txn_1h}</span>',
-            ])
+        def build_whale_table():
+            whale_rows = []
+            for whale in whales[:10]:  # Show top 10
+                addr = whale.get("address", "")
+                short_addr = f"{addr[:4]}...{addr[-4:]}" if len(addr) > 8 else addr
+                source = whale.get("source", "").upper()[:3]
+                pnl = whale.get("pnl_24h", 0)
+                vol = whale.get("volume", 0)
+                txn_1h = whale.get("txn_count_1h", 0)
+                is_active = whale.get("is_active", False)
+
+                # Activity indicator
+                status = f'<span style="color: {theme["positive"]};">●</span>' if is_active else f'<span style="color: #333;">○</span>'
+
+                # PnL color
+                pnl_color = theme["positive"] if pnl > 0 else theme["negative"] if pnl < 0 else "#888"
+                pnl_str = f"+${pnl:,.0f}" if pnl > 0 else f"-${abs(pnl):,.0f}" if pnl < 0 else "$0"
+
+                source_color = PROTOCOL_COLORS.get("Pacifica", theme["accent"]) if source == "PAC" else PROTOCOL_COLORS.get("Jupiter", theme["accent"])
+
+                whale_rows.append([
+                    status,
+                    f'<span style="color: #e0e0e0;">{short_addr}</span>',
+                    f'<span style="color: {source_color};">{source}</span>',
+                    f'<span style="color: {pnl_color};">{pnl_str}</span>',
+                    f'<span style="color: #888;">${vol:,.0f}</span>',
+                    f'<span style="color: {theme["accent"] if txn_1h > 0 else "#555"};">{txn_1h}</span>',
+                ])
 
-        st.markdown(render_terminal_table(
-            headers=["", "ADDRESS", "SRC", "P&L", "VOLUME", "TXN_1H"],
-            rows=whale_rows
-        ), unsafe_allow_html=True)
+            return render_terminal_table(
+                headers=["", "ADDRESS", "SRC", "P&L", "VOLUME", "TXN_1H"],
+                rows=whale_rows
+            )
+
+        st.markdown(
+            cached_html("whale_table", cache_mtime, st.session_state.terminal_theme, build_whale_table),
+            unsafe_allow_html=True,
+        )
 
         st.caption(f"● Active in last 1h | Data updated: {whale_data.get('timestamp', 'Unknown')[:16]}")
     else:
@@ -1977,24 +1681,30 @@ else:
 
         drift_liqs = drift_liq.get("liquidations", [])[:5]
         if drift_liqs:
-            drift_liq_rows = []
-            for liq in drift_liqs:
-                sig = liq.get("signature", "")
-                short_sig = f"{sig[:6]}...{sig[-6:]}" if len(sig) > 12 else sig
-                ts = liq.get("timestamp", "")
-                time_str = ts[11:16] if ts and len(ts) > 16 else "?"  # Extract HH:MM
-                liq_type = liq.get("type", "?").upper()[:4]
-
-                drift_liq_rows.append([
-                    f'<span style="color: #888;">{time_str}</span>',
-                    f'<span style="color: #e0e0e0;">{short_sig}</span>',
-                    f'<span style="color: {theme["warning"]};">{liq_type}</span>',
-                ])
+            def build_drift_liquidations_table():
+                drift_liq_rows = []
+                for liq in drift_liqs:
+                    sig = liq.get("signature", "")
+                    short_sig = f"{sig[:6]}...{sig[-6:]}" if len(sig) > 12 else sig
+                    ts = liq.get("timestamp", "")
+                    time_str = ts[11:16] if ts and len(ts) > 16 else "?"  # Extract HH:MM
+                    liq_type = liq.get("type", "?").upper()[:4]
+
+                    drift_liq_rows.append([
+                        f'<span style="color: #888;">{time_str}</span>',
+                        f'<span style="color: #e0e0e0;">{short_sig}</span>',
+                        f'<span style="color: {theme["warning"]};">{liq_type}</span>',
+                    ])
+
+                return render_terminal_table(
+                    headers=["TIME", "SIGNATURE", "TYPE"],
+                    rows=drift_liq_rows
+                )
 
-            st.markdown(render_terminal_table(
-                headers=["TIME", "SIGNATURE", "TYPE"],
-                rows=drift_liq_rows
-            ), unsafe_allow_html=True)
+            st.markdown(
+                cached_html("drift_liquidations_table", cache_mtime, st.session_state.terminal_theme, build_drift_liquidations_table),
+                unsafe_allow_html=True,
+            )
         else:
             st.info("No recent Drift liquidations")
 
@@ -2007,22 +1717,28 @@ else:
 
         jupiter_liqs = jupiter_liq.get("liquidations", [])[:5]
         if jupiter_liqs:
-            jup_liq_rows = []
-            for liq in jupiter_liqs:
-                sig = liq.get("signature", "")
-                short_sig = f"{sig[:6]}...{sig[-6:]}" if len(sig) > 12 else sig
-                ts = liq.get("timestamp", "")
-                time_str = ts[11:16] if ts and len(ts) > 16 else "?"
-
-                jup_liq_rows.append([
-                    f'<span style="color: #888;">{time_str}</span>',
-                    f'<span style="color: #e0e0e0;">{short_sig}</span>',
-                ])
+            def build_jupiter_liquidations_table():
+                jup_liq_rows = []
+                for liq in jupiter_liqs:
+                    sig = liq.get("signature", "")
+                    short_sig = f"{sig[:6]}...{sig[-6:]}" if len(sig) > 12 else sig
+                    ts = liq.get("timestamp", "")
+                    time_str = ts[11:16] if ts and len(ts) > 16 else "?"
+
+                    jup_liq_rows.append([
+                        f'<span style="color: #888;">{time_str}</span>',
+                        f'<span style="color: #e0e0e0;">{short_sig}</span>',
+                    ])
+
+                return render_terminal_table(
+                    headers=["TIME", "SIGNATURE"],
+                    rows=jup_liq_rows
+                )
 
-            st.markdown(render_terminal_table(
-                headers=["TIME", "SIGNATURE"],
-                rows=jup_liq_rows
-            ), unsafe_allow_html=True)
+            st.markdown(
+                cached_html("jupiter_liquidations_table", cache_mtime, st.session_state.terminal_theme, build_jupiter_liquidations_table),
+                unsafe_allow_html=True,
+            )
         else:
             st.info("No recent Jupiter liquidations")
 
@@ -2033,64 +1749,28 @@ st.divider()
 # Unique Insights Section
 st.markdown(terminal_section_header("Quick Insights"), unsafe_allow_html=True)
 
-col1, col2, col3, col4 = st.columns(4)
+col1, col2 = st.columns(2)
 
 with col1:
     st.subheader("Market Concentration")
     if drift_markets:
-        total_vol = sum(m["volume"] for m in drift_markets.values())
-        sorted_by_vol = sorted(drift_markets.items(), key=lambda x: x[1]["volume"], reverse=True)
+        market_aggregates = derived["market_aggregates"]
+        total_vol = market_aggregates["drift_total_volume"]
+        top_by_vol = market_aggregates["drift_top_by_volume"]
 
-        top3_vol = sum(m["volume"] for _, m in sorted_by_vol[:3])
+        top3_vol = sum(volume for _, volume in top_by_vol)
         top3_pct = (top3_vol / total_vol * 100) if total_vol > 0 else 0
 
         st.metric("Top 3 Markets", f"{top3_pct:.1f}%", "of total volume")
-        st.write(f"SOL-PERP: {(sorted_by_vol[0][1]['volume'] / total_vol * 100):.1f}%")
-        st.write(f"Active markets: {len([m for m in drift_markets.values() if m['volume'] > 1000])}")
+        st.write(f"SOL-PERP: {(top_by_vol[0][1] / total_vol * 100):.1f}%")
+        st.write(f"Active markets: {market_aggregates['drift_active_markets']}")
 
 with col2:
     st.subheader("OI Leaders")
     if drift_markets:
-        oi_data = [(k, v.get("open_interest", 0) * v.get("last_price", 0))
-                   for k, v in drift_markets.items()]
-        sorted_by_oi = sorted(oi_data, key=lambda x: x[1], reverse=True)[:3]
-
-        for i, (market, oi) in enumerate(sorted_by_oi, 1):
+        for i, (market, oi) in enumerate(derived["market_aggregates"]["drift_top_by_oi"], 1):
             st.write(f"**#{i}** {market}: ${oi:,.0f}")
 
-with col3:
-    st.subheader(f"Active Traders ({time_window})")
-    insights_window = get_time_window_data(cache, time_window)
-    drift_count = insights_window.get("drift_traders", 0)
-    jupiter_count = insights_window.get("jupiter_traders", 0)
-    pacifica_count = insights_window.get("pacifica_traders", 0)
-    if drift_count > 0 or jupiter_count > 0 or pacifica_count > 0:
-        st.metric("Drift", f"{drift_count:,}")
-        st.metric("Jupiter", f"{jupiter_count:,}")
-        st.metric(
-            "Pacifica",
-            f"{pacifica_count:,}",
-            help="Pacifica uses hybrid architecture (off-chain CLOB, on-chain settlement). This count represents active on-chain users, not all traders. May undercount due to off-chain activity, or overcount depositors who haven't traded."
-        )
-    else:
-        st.write("No trader data available")
-
-with col4:
-    st.subheader(f"Liquidations ({time_window})")
-    liquidations = insights_window.get("liquidations", {})
-    if liquidations.get("error"):
-        st.warning(f"Liquidations unavailable for {time_window}")
-        if "timeout" in liquidations.get("error", "").lower() or "skipped" in liquidations.get("error", "").lower():
-            st.caption("Liquidation queries time out beyond 8h. Try a shorter window.")
-        else:
-            st.caption(liquidations.get("error", "Unknown error"))
-    elif liquidations.get("count", 0) > 0:
-        st.metric("Events", f"{liquidations['count']:,}")
-        st.write(f"Txns: {liquidations.get('txns', 0):,}")
-    else:
-        st.info("No liquidations")
-    st.caption("Source: Drift")
-
 # Footer - Terminal Style
 st.divider()
 
@@ -0,0 +1,71 @@
+"""Tests for the hedged Solana RPC path in solana_perps_dashboard."""
+
+import os
+import unittest
+from unittest import mock
+
+import requests
+
+# The module refuses to import without a Dune key; these tests never call Dune
+os.environ.setdefault("DUNE_API_KEY", "test")
+
+import solana_perps_dashboard as dashboard  # noqa: E402
+
+PRIMARY_URL = "https://primary.example/?api-key=secret"
+FALLBACK_URL = "https://fallback.example"
+
+
+class FakeResponse:
+    def __init__(self, content=b'{"result": "ok"}', status_code=200):
+        self.content = content
+        self.status_code = status_code
+        self.headers = {}
+        self.reason = "error"
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error for url: {PRIMARY_URL}", response=self)
+
+
+class HedgedRpcOrderTest(unittest.TestCase):
+    def setUp(self):
+        dashboard._rpc_latency.clear()
+        self.calls = []
+
+    def tearDown(self):
+        dashboard._rpc_latency.clear()
+
+    def _post(self, url, **kwargs):
+        self.calls.append(url)
+        return FakeResponse()
+
+    def test_configured_primary_goes_first_until_all_endpoints_measured(self):
+        with mock.patch.object(dashboard._SESSION, "post", side_effect=self._post):
+            for _ in range(3):
+                self.assertIsNotNone(dashboard._hedged_rpc_post({}, [PRIMARY_URL, FALLBACK_URL]))
+
+        # Only the primary was ever measured, so it must stay first on every call
+        self.assertEqual(self.calls, [PRIMARY_URL] * 3)
+
+    def test_faster_endpoint_goes_first_once_all_measured(self):
+        dashboard._rpc_latency.update({PRIMARY_URL: 5.0, FALLBACK_URL: 0.01})
+        with mock.patch.object(dashboard._SESSION, "post", side_effect=self._post):
+            dashboard._hedged_rpc_post({}, [PRIMARY_URL, FALLBACK_URL])
+
+        self.assertEqual(self.calls[0], FALLBACK_URL)
+
+
+class DescribeRpcErrorTest(unittest.TestCase):
+    def test_http_error_omits_url(self):
+        try:
+            FakeResponse(status_code=429).raise_for_status()
+        except requests.HTTPError as e:
+            self.assertEqual(dashboard._describe_rpc_error(e), "HTTP 429")
+
+    def test_connection_error_omits_url(self):
+        error = requests.ConnectionError(f"Max retries exceeded with url: {PRIMARY_URL}")
+        self.assertNotIn("secret", dashboard._describe_rpc_error(error))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+"""Tests for the incremental signature-count checkpoints in solana_perps_dashboard."""
+
+import json
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+# The module refuses to import without a Dune key; these tests never call Dune
+os.environ.setdefault("DUNE_API_KEY", "test")
+
+import solana_perps_dashboard as dashboard  # noqa: E402
+
+PROGRAM_ID = "Prog1111111111111111111111111111111111111111"
+
+
+def _page(prefix, count, block_time):
+    return [{"signature": f"{prefix}{i}", "blockTime": block_time, "err": None} for i in range(count)]
+
+
+class SignatureCheckpointTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "signature_checkpoints.json")
+        patcher = mock.patch.object(dashboard, "SIGNATURE_CHECKPOINTS_PATH", self.path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        sleep_patcher = mock.patch.object(dashboard.time, "sleep")
+        sleep_patcher.start()
+        self.addCleanup(sleep_patcher.stop)
+        self.now = int(time.time())
+
+    def _write_checkpoints(self, checkpoints):
+        with open(self.path, "w") as f:
+            json.dump(checkpoints, f)
+
+    def _read_checkpoints(self):
+        with open(self.path) as f:
+            return json.load(f)
+
+    def _previous_checkpoint(self):
+        bucket = str(self.now - 600 - (self.now - 600) % dashboard.SIGNATURE_BUCKET_SECONDS)
+        return {"newest_signature": "old", "buckets": {bucket: 5}}
+
+    def test_capped_scan_keeps_previous_checkpoint(self):
+        key = dashboard._signature_checkpoint_key(PROGRAM_ID, 24)
+        previous = self._previous_checkpoint()
+        self._write_checkpoints({key: previous})
+
+        # Every page is full, so the scan stops on the page cap before reaching "old"
+        pages = iter(_page(f"p{n}-", 1000, self.now - 60) for n in range(100))
+        with mock.patch.object(dashboard, "SIGNATURE_MAX_PAGES", 2), \
+                mock.patch.object(dashboard, "rpc_call", side_effect=lambda *a: next(pages)):
+            count = dashboard.fetch_signature_count(PROGRAM_ID, hours=24)
+
+        self.assertEqual(count, 2005)
+        self.assertEqual(self._read_checkpoints()[key], previous)
+
+    def test_complete_scan_advances_checkpoint(self):
+        key = dashboard._signature_checkpoint_key(PROGRAM_ID, 24)
+        self._write_checkpoints({key: self._previous_checkpoint()})
+
+        with mock.patch.object(dashboard, "rpc_call", return_value=_page("new", 3, self.now - 60)):
+            count = dashboard.fetch_signature_count(PROGRAM_ID, hours=24)
+
+        self.assertEqual(count, 8)
+        saved = self._read_checkpoints()[key]
+        self.assertEqual(saved["newest_signature"], "new0")
+        self.assertEqual(sum(saved["buckets"].values()), 8)
+
+    def test_checkpoints_are_keyed_by_window(self):
+        self._write_checkpoints({dashboard._signature_checkpoint_key(PROGRAM_ID, 1): self._previous_checkpoint()})
+
+        with mock.patch.object(dashboard, "rpc_call", return_value=_page("new", 3, self.now - 60)) as rpc:
+            dashboard.fetch_signature_count(PROGRAM_ID, hours=24)
+
+        # The 1h checkpoint must not bound the 24h scan
+        self.assertNotIn("until", rpc.call_args.args[1][1])
+        self.assertIn(dashboard._signature_checkpoint_key(PROGRAM_ID, 24), self._read_checkpoints())
+
+
+if __name__ == "__main__":
+    unittest.main()
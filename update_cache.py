@@ -16,6 +16,13 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional
 
+from cache_views import build_derived_views
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -37,14 +44,30 @@ HISTORY_SNAPSHOT_INTERVAL_MINUTES = 60  # Save snapshot every hour
 # Required keys for valid cache
 REQUIRED_CACHE_KEYS = ["protocols", "drift_markets", "time_windows", "updated_at"]
 
+# DeFiLlama protocol name -> 24h trader count key in cache["time_windows"]
+PROTOCOL_TRADER_KEYS = {
+    "Drift Trade": "drift_traders",
+    "Jupiter Perpetual Exchange": "jupiter_traders",
+    "Pacifica": "pacifica_traders",
+    "FlashTrade": "flashtrade_traders",
+    "Adrena Protocol": "adrena_traders",
+}
+
+
+def read_json(path: Path):
+    """Parse a JSON file, with orjson when available."""
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    with open(path) as f:
+        return json.load(f)
+
 
 def load_existing_cache() -> Optional[dict]:
     """Load existing cache file as fallback."""
     if not CACHE_PATH.exists():
         return None
     try:
-        with open(CACHE_PATH) as f:
-            return json.load(f)
+        return read_json(CACHE_PATH)
     except (json.JSONDecodeError, IOError) as e:
         logger.error(f"Failed to load existing cache: {e}")
         return None
@@ -95,8 +118,7 @@ def load_history() -> dict:
     if not HISTORY_PATH.exists():
         return {"snapshots": [], "last_snapshot_at": None}
     try:
-        with open(HISTORY_PATH) as f:
-            return json.load(f)
+        return read_json(HISTORY_PATH)
     except (json.JSONDecodeError, IOError) as e:
         logger.error(f"Failed to load history: {e}")
         return {"snapshots": [], "last_snapshot_at": None}
@@ -267,7 +289,7 @@ from solana_perps_dashboard import (
     fetch_flashtrade_traders,
     fetch_adrena_traders,
     fetch_jupiter_market_breakdown,
-    fetch_signature_count,
+    fetch_signature_counts_batch,
     distribute_volume_by_trades,
     fetch_pacifica_pnl_leaderboard,
     fetch_jupiter_pnl_leaderboard,
@@ -426,22 +448,20 @@ def update_cache():
         cache["liquidations_1h"] = cache["time_windows"]["1h"].get("liquidations", {"count": 0, "txns": 0})
         cache["wallet_overlap"] = cache["time_windows"]["1h"].get("wallet_overlap", {})
 
-    # Fetch signature counts in parallel for protocols with program IDs
-    logger.info("Fetching signature counts in parallel...")
-    tx_counts = {}
-    with ThreadPoolExecutor(max_workers=4) as executor:
-        future_to_protocol = {
-            executor.submit(fetch_signature_count, metadata["program_id"], 24): name
-            for name, metadata in PROTOCOL_METADATA.items()
-            if metadata.get("program_id")
-        }
-        for future in as_completed(future_to_protocol):
-            protocol_name = future_to_protocol[future]
-            try:
-                tx_counts[protocol_name] = future.result()
-            except Exception as e:
-                logger.error(f"Tx count for {protocol_name} failed: {e}")
-                tx_counts[protocol_name] = 0
+    # Fetch signature counts for all protocols with program IDs in one batched RPC request per page
+    logger.info("Fetching signature counts (batched)...")
+    program_ids = {
+        name: metadata["program_id"]
+        for name, metadata in PROTOCOL_METADATA.items()
+        if metadata.get("program_id")
+    }
+    try:
+        counts_by_program = fetch_signature_counts_batch(list(program_ids.values()), 24)
+    except Exception as e:
+        logger.error(f"Tx counts failed: {e}")
+        counts_by_program = {}
+    tx_counts = {name: counts_by_program.get(pid, 0) for name, pid in program_ids.items()}
+    traders_24h = cache["time_windows"].get("24h", {})
 
     # Build protocol metrics dynamically from DeFiLlama data
     for protocol_name, volume_data in defillama_volumes.items():
@@ -456,19 +476,9 @@ def update_cache():
         fee_rate = metadata.get("fee_rate", 0.0005)  # Default 0.05%
         tx_count = tx_counts.get(protocol_name, 0)
 
-        # Use actual 24h trader counts from Dune for known protocols
-        if protocol_name == "Drift Trade":
-            traders = cache["time_windows"].get("24h", {}).get("drift_traders", 0)
-        elif protocol_name == "Jupiter Perpetual Exchange":
-            traders = cache["time_windows"].get("24h", {}).get("jupiter_traders", 0)
-        elif protocol_name == "Pacifica":
-            traders = cache["time_windows"].get("24h", {}).get("pacifica_traders", 0)
-        elif protocol_name == "FlashTrade":
-            traders = cache["time_windows"].get("24h", {}).get("flashtrade_traders", 0)
-        elif protocol_name == "Adrena Protocol":
-            traders = cache["time_windows"].get("24h", {}).get("adrena_traders", 0)
-        else:
-            traders = 0  # No Dune query for this protocol
+        # Use actual 24h trader counts from Dune for known protocols (0 if no Dune query)
+        trader_key = PROTOCOL_TRADER_KEYS.get(protocol_name)
+        traders = traders_24h.get(trader_key, 0) if trader_key else 0
 
         fees = volume_24h * fee_rate
 
@@ -483,12 +493,12 @@ def update_cache():
             "fees": fees,
         })
 
+    protocols_by_name = {p["protocol"]: p for p in cache["protocols"]}
+
     # Fetch Jupiter market breakdown from Dune
     try:
         jupiter_trades = fetch_jupiter_market_breakdown(hours=1)
-        jupiter_volume = next(
-            (p["volume_24h"] for p in cache["protocols"] if p["protocol"] == "Jupiter Perpetual Exchange"), 0
-        )
+        jupiter_volume = protocols_by_name.get("Jupiter Perpetual Exchange", {}).get("volume_24h", 0)
         jupiter_volumes = distribute_volume_by_trades(jupiter_volume, jupiter_trades)
         cache["jupiter_markets"] = {
             "trades": jupiter_trades,
@@ -541,6 +551,9 @@ def update_cache():
             logger.error(f"RPC liquidations fetch failed: {e}")
             cache["liquidations_rpc"] = {"drift": {}, "jupiter": {}, "total_count": 0, "error": str(e)}
 
+    # Precompute display-ready views so the app doesn't rebuild them on every rerun
+    cache["derived"] = build_derived_views(cache)
+
     # Save to file (with validation and fallback)
     logger.info("=" * 60)
     cache_saved = save_cache(cache, old_cache)